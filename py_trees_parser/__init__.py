@@ -13,5 +13,6 @@
 # limitations under the License.
 # this needs to be imported first
 from py_trees_parser.parser import BTParser
+from py_trees_parser.registry import register_tag, unregister_tag
 
-__all__ = ("BTParser",)
+__all__ = ("BTParser", "register_tag", "unregister_tag")
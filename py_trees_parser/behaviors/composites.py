@@ -0,0 +1,305 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Composites that tick their children concurrently."""
+
+import functools
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, wait
+
+import py_trees
+from py_trees.common import ParallelPolicy, Status
+
+
+def _tick_child(child: py_trees.behaviour.Behaviour) -> list[py_trees.behaviour.Behaviour]:
+    """Tick a child to completion and collect the nodes it yields."""
+    return list(child.tick())
+
+
+class _DaemonPool:
+    """
+    A bounded thread pool whose workers are daemon threads.
+
+    Unlike the workers of a `ThreadPoolExecutor`, daemon threads are not joined at exit, so a
+    tick that never returns does not keep the process from exiting.
+    """
+
+    def __init__(self, max_workers: int, name: str):
+        """Initialize the _DaemonPool."""
+        self.max_workers = max_workers
+        self.name = name
+        self._work = queue.SimpleQueue()
+        self._workers = 0
+
+    def submit(self, function: Callable, *args) -> Future:
+        """Schedule a function, starting a worker if the pool is not full."""
+        future = Future()
+        self._work.put((future, function, args))
+        if self._workers < self.max_workers:
+            threading.Thread(
+                target=self._run, name=f"{self.name}_{self._workers}", daemon=True
+            ).start()
+            self._workers += 1
+
+        return future
+
+    def _run(self) -> None:
+        """Run scheduled functions until the pool is shut down."""
+        while True:
+            item = self._work.get()
+            if item is None:
+                return
+            future, function, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(function(*args))
+            except Exception as ex:
+                future.set_exception(ex)
+
+    def shutdown(self) -> None:
+        """Cancel the functions that have not started and stop the workers once they are idle."""
+        while True:
+            try:
+                item = self._work.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[0].cancel()
+        for _ in range(self._workers):
+            self._work.put(None)
+        self._workers = 0
+
+
+class ThreadedParallel(py_trees.composites.Parallel):
+    """
+    A parallel that ticks its children concurrently on a bounded thread pool.
+
+    Children are ticked at the same time instead of one after another, so a child that blocks,
+    e.g. on a service call, does not delay its siblings. The outcome is decided with the same
+    policies as `py_trees.composites.Parallel`.
+
+    With a deadline, a tick returns once the deadline has passed even if some children have not
+    finished ticking. Those children count as RUNNING and are not ticked again until their
+    pending tick completes, which is picked up by a later tick. Stopping the parallel does not
+    wait for pending ticks. A child is never stopped while it is being ticked, instead it is
+    stopped once its pending tick completes and is not ticked again until then.
+
+    Children are ticked from worker threads, so they must not share state that is not
+    thread-safe, and the nodes they yield are only seen by visitors once their tick completes.
+    The worker threads are daemon threads: a tick that is still running when the parallel is
+    shut down is abandoned and does not keep the process from exiting.
+
+    Attributes:
+    ----------
+        max_workers (int | None): The maximum number of children ticked at the same time.
+        deadline (float | None): The maximum time in seconds a tick waits for the children.
+
+    Args:
+    ----
+        name (str): The name of the behavior.
+        policy (ParallelPolicy.Base): The policy for deciding success.
+        children (list[Behaviour], optional): The children of the parallel.
+        max_workers (int, optional): The maximum number of children ticked at the same time,
+            defaults to the number of children.
+        deadline (float, optional): The maximum time in seconds a tick waits for the children,
+            defaults to waiting for all children.
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        policy: ParallelPolicy.Base,
+        children: list[py_trees.behaviour.Behaviour] | None = None,
+        max_workers: int | None = None,
+        deadline: float | None = None,
+    ):
+        """Initialize the ThreadedParallel."""
+        super().__init__(name=name, policy=policy, children=children)
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(f"{name} requires max_workers of at least 1, got {max_workers}")
+        if deadline is not None and deadline <= 0:
+            raise ValueError(f"{name} requires a positive deadline, got {deadline}")
+
+        self.max_workers = max_workers
+        self.deadline = deadline
+        self._executor = None
+        self._pending: dict[py_trees.behaviour.Behaviour, Future] = {}
+        self._stopping: dict[py_trees.behaviour.Behaviour, Future] = {}
+
+    def _submit(self, child: py_trees.behaviour.Behaviour) -> Future:
+        """Start ticking a child on the thread pool."""
+        if self._executor is None:
+            self._executor = _DaemonPool(
+                max_workers=self.max_workers or max(len(self.children), 1), name=self.name
+            )
+
+        return self._executor.submit(_tick_child, child)
+
+    def _stop_child(self, child: py_trees.behaviour.Behaviour, future: Future) -> None:
+        """Stop a child whose tick was pending when the parallel stopped, once it completes."""
+        if not future.cancelled() and future.exception() is not None:
+            self.logger.error(f"Tick of {child.name} failed: {future.exception()}")
+        if child.status == Status.RUNNING:
+            child.stop(Status.INVALID)
+        del self._stopping[child]
+
+    def _policy_status(self) -> Status:
+        """
+        Decide the status of the parallel from the status of its children.
+
+        Children with a pending tick, or that are being stopped, count as RUNNING.
+
+        Returns:
+        -------
+            The new status of the parallel.
+
+        """
+        status = {
+            child: Status.RUNNING
+            if child in self._pending or child in self._stopping
+            else child.status
+            for child in self.children
+        }
+
+        self.current_child = self.children[-1]
+        failed = [child for child in self.children if status[child] == Status.FAILURE]
+        if failed:
+            self.current_child = failed[0]
+            return Status.FAILURE
+
+        if type(self.policy) is ParallelPolicy.SuccessOnAll:
+            selected = self.children
+        elif type(self.policy) is ParallelPolicy.SuccessOnSelected:
+            selected = self.policy.children
+        elif type(self.policy) is ParallelPolicy.SuccessOnOne:
+            successful = [child for child in self.children if status[child] == Status.SUCCESS]
+            if successful:
+                self.current_child = successful[-1]
+                return Status.SUCCESS
+            return Status.RUNNING
+        else:
+            raise RuntimeError(
+                f"this parallel has been configured with an unrecognised policy [{self.policy}]"
+            )
+
+        if all(status[child] == Status.SUCCESS for child in selected):
+            self.current_child = selected[-1]
+            return Status.SUCCESS
+        return Status.RUNNING
+
+    def tick(self) -> Iterator[py_trees.behaviour.Behaviour]:
+        """
+        Tick the children concurrently and decide the outcome with the policy.
+
+        Yields:
+        ------
+            A reference to itself or one of its children.
+
+        Raises:
+        ------
+            RuntimeError: If the policy configuration is invalid.
+
+        """
+        self.logger.debug(f"{self.__class__.__name__}.tick()")
+        self.validate_policy_configuration()
+
+        if self.status != Status.RUNNING:
+            self.logger.debug(f"{self.__class__.__name__}.tick(): re-initialising")
+            for child in self.children:
+                if child.status != Status.INVALID and child not in self._stopping:
+                    child.stop(Status.INVALID)
+            self.current_child = None
+            self.initialise()
+
+        if not self.children:
+            self.current_child = None
+            self.stop(Status.SUCCESS)
+            yield self
+            return
+
+        for child in self.children:
+            if child in self._pending or child in self._stopping:
+                continue
+            if self.policy.synchronise and child.status == Status.SUCCESS:
+                continue
+            self._pending[child] = self._submit(child)
+
+        wait(self._pending.values(), timeout=self.deadline)
+        for child in self.children:
+            future = self._pending.get(child)
+            if future is None or not future.done():
+                continue
+            del self._pending[child]
+            yield from future.result()
+
+        if self._pending:
+            self.logger.debug(
+                f"{self.__class__.__name__}.tick(): deadline passed for "
+                f"{[child.name for child in self._pending]}"
+            )
+
+        new_status = self._policy_status()
+        if new_status != Status.RUNNING:
+            self.stop(new_status)
+        self.status = new_status
+        yield self
+
+    def stop(self, new_status: Status = Status.INVALID) -> None:
+        """
+        Stop any running children, children with a pending tick once that tick completes.
+
+        Args:
+        ----
+            new_status (Status): The status the parallel is transitioning to.
+
+        """
+        self.logger.debug(f"{self.__class__.__name__}.stop()[{self.status}->{new_status}]")
+
+        pending, self._pending = self._pending, {}
+        self._stopping.update(pending)
+        for child, future in pending.items():
+            future.add_done_callback(functools.partial(self._stop_child, child))
+
+        if new_status == Status.INVALID:
+            self.current_child = None
+        for child in self.children:
+            if child in self._stopping:
+                continue
+            if child.status == Status.RUNNING or (
+                new_status == Status.INVALID and child.status != Status.INVALID
+            ):
+                child.stop(Status.INVALID)
+
+        self.terminate(new_status)
+        self.status = new_status
+        self.iterator = self.tick()
+
+    def shutdown(self) -> None:
+        """
+        Shut down the thread pool without waiting for pending ticks.
+
+        Ticks that have not started are cancelled. A tick that is still running is abandoned: it
+        completes on its daemon thread, after which its child is stopped if the parallel was.
+
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        self._pending = {
+            child: future for child, future in self._pending.items() if not future.cancelled()
+        }
@@ -0,0 +1,134 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Condition behaviors that check several blackboard variables in a single tick."""
+
+import operator
+
+import py_trees
+
+
+class FusedBlackboardCheck(py_trees.behaviour.Behaviour):
+    """
+    Check a batch of blackboard comparisons with a single blackboard client and a single tick.
+
+    This behaves like a run of sibling `py_trees.behaviours.CheckBlackboardVariableValue` nodes:
+    with require_all set, the checks are evaluated in order until one fails, like the checks in
+    a sequence; otherwise they are evaluated until one succeeds, like the checks in a selector.
+    The behavior never returns RUNNING.
+
+    Attributes:
+    ----------
+        checks (list[ComparisonExpression]): The comparisons to check.
+        require_all (bool): Whether all checks must succeed, rather than any.
+        check_feedback (list[str]): The feedback message of every check in the last tick, the
+            same message a `CheckBlackboardVariableValue` would give, or an empty string if the
+            check was not evaluated.
+
+    Args:
+    ----
+        name (str): The name of the behavior.
+        checks (list[ComparisonExpression]): The comparisons to check.
+        require_all (bool, optional): Whether all checks must succeed, rather than any.
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        checks: list[py_trees.common.ComparisonExpression],
+        require_all: bool = True,
+    ):
+        """Initialize the FusedBlackboardCheck."""
+        super().__init__(name=name)
+        if len(checks) == 0:
+            raise ValueError(f"{name} requires at least one check")
+
+        self.checks = list(checks)
+        self.require_all = require_all
+        self.check_feedback = [""] * len(self.checks)
+
+        self.blackboard = self.attach_blackboard_client()
+        self._lookups = []
+        for check in self.checks:
+            key, _, key_attributes = check.variable.partition(".")
+            if not self.blackboard.is_registered(key):
+                self.blackboard.register_key(key=key, access=py_trees.common.Access.READ)
+            getter = operator.attrgetter(key_attributes) if key_attributes else None
+            self._lookups.append((key, getter))
+
+    def _evaluate(self, index: int) -> bool:
+        """
+        Evaluate a single check and record its feedback message.
+
+        Args:
+        ----
+            index (int): The index of the check.
+
+        Returns:
+        -------
+            True if the comparison succeeded, False otherwise.
+
+        """
+        check = self.checks[index]
+        key, getter = self._lookups[index]
+        try:
+            value = self.blackboard.get(key)
+        except KeyError:
+            self.check_feedback[index] = (
+                f"key '{check.variable}' does not yet exist on the blackboard"
+            )
+            return False
+
+        if getter is not None:
+            try:
+                value = getter(value)
+            except AttributeError:
+                self.check_feedback[index] = (
+                    "blackboard key-value pair exists, but the value does not "
+                    f"have the requested nested attributes [{key}]"
+                )
+                return False
+
+        success = bool(check.operator(value, check.value))
+        outcome = "succeeded" if success else "failed"
+        self.check_feedback[index] = (
+            f"'{check.variable}' comparison {outcome} [v: {value}][e: {check.value}]"
+        )
+        return success
+
+    def update(self) -> py_trees.common.Status:
+        """
+        Evaluate the checks in order until the outcome is decided.
+
+        Returns:
+        -------
+            SUCCESS if all (require_all) or any of the checks succeeded, FAILURE otherwise.
+
+        """
+        self.logger.debug(f"{self.__class__.__name__}.update()")
+        self.check_feedback = [""] * len(self.checks)
+
+        for index in range(len(self.checks)):
+            success = self._evaluate(index)
+            if success != self.require_all:
+                self.feedback_message = self.check_feedback[index]
+                return (
+                    py_trees.common.Status.SUCCESS if success else py_trees.common.Status.FAILURE
+                )
+
+        self.feedback_message = self.check_feedback[-1]
+        return (
+            py_trees.common.Status.SUCCESS if self.require_all else py_trees.common.Status.FAILURE
+        )
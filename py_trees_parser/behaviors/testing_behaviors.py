@@ -36,12 +36,16 @@
 # Imports
 ##############################################################################
 
+import functools
+
 import py_trees
 import py_trees_ros
 import rcl_interfaces.msg as rcl_msgs
 import rcl_interfaces.srv as rcl_srvs
 import std_msgs.msg as std_msgs
 
+from py_trees_parser.resources import find_resource_pool
+
 ##############################################################################
 # Behaviours
 ##############################################################################
@@ -58,6 +62,10 @@ class FlashLedStrip(py_trees.behaviour.Behaviour):
     command to the LEDStrip if it is cancelled or interrupted by a higher
     priority behaviour.
 
+    When the tree was built by the parser, the publisher is shared with all
+    other behaviours publishing on the same topic, see
+    :mod:`py_trees_parser.resources`.
+
     Publishers:
     ----------
         * **/led_strip/command** (:class:`std_msgs.msg.String`)
@@ -76,6 +84,8 @@ class FlashLedStrip(py_trees.behaviour.Behaviour):
         super(FlashLedStrip, self).__init__(name=name)
         self.topic_name = topic_name
         self.colour = colour
+        self.pool = None
+        self.publisher = None
 
     def setup(self, **kwargs):
         """
@@ -97,11 +107,20 @@ class FlashLedStrip(py_trees.behaviour.Behaviour):
             error_message = "didn't find 'node' in setup's kwargs [{}]".format(self.qualified_name)
             raise KeyError(error_message) from e  # 'direct cause' traceability
 
-        self.publisher = self.node.create_publisher(
-            msg_type=std_msgs.String,
-            topic=self.topic_name,
-            qos_profile=py_trees_ros.utilities.qos_profile_latched(),
-        )
+        self.pool = find_resource_pool(self)
+        if self.pool is None:
+            self.publisher = self.node.create_publisher(
+                msg_type=std_msgs.String,
+                topic=self.topic_name,
+                qos_profile=py_trees_ros.utilities.qos_profile_latched(),
+            )
+        else:
+            self.publisher = self.pool.publisher(
+                self.node,
+                msg_type=std_msgs.String,
+                topic=self.topic_name,
+                qos_profile=py_trees_ros.utilities.qos_profile_latched(),
+            )
         self.feedback_message = "publisher created"
 
     def update(self) -> py_trees.common.Status:
@@ -142,6 +161,18 @@ class FlashLedStrip(py_trees.behaviour.Behaviour):
         self.publisher.publish(std_msgs.String(data=""))
         self.feedback_message = "cleared"
 
+    def shutdown(self):
+        """
+        Release the publisher if it is shared.
+
+        The publisher is kept until shutdown rather than released on terminate,
+        as it is used again to clear the led strip on every terminate.
+        """
+        self.logger.debug("{}.shutdown()".format(self.qualified_name))
+        if self.pool is not None and self.publisher is not None:
+            self.pool.release(self.publisher)
+            self.publisher = None
+
 
 class ScanContext(py_trees.behaviour.Behaviour):
     """
@@ -152,6 +183,10 @@ class ScanContext(py_trees.behaviour.Behaviour):
     that for the the duration of the context before returning it to
     it's original value in :meth:`terminate()`.
 
+    When the tree was built by the parser, the parameter clients are shared
+    with all other behaviours calling the same services, see
+    :mod:`py_trees_parser.resources`.
+
     Args:
     ----
         name (:obj:`str`): name of the behaviour
@@ -162,6 +197,8 @@ class ScanContext(py_trees.behaviour.Behaviour):
         super().__init__(name=name)
 
         self.cached_context = None
+        self.pool = None
+        self.parameter_clients = {}
 
     def setup(self, **kwargs):
         """
@@ -186,11 +223,15 @@ class ScanContext(py_trees.behaviour.Behaviour):
             raise KeyError(error_message) from e  # 'direct cause' traceability
 
         # parameter service clients
+        self.pool = find_resource_pool(self)
+        create_client = self.node.create_client
+        if self.pool is not None:
+            create_client = functools.partial(self.pool.client, self.node)
         self.parameter_clients = {
-            "get_safety_sensors": self.node.create_client(
+            "get_safety_sensors": create_client(
                 rcl_srvs.GetParameters, "/safety_sensors/get_parameters"
             ),
-            "set_safety_sensors": self.node.create_client(
+            "set_safety_sensors": create_client(
                 rcl_srvs.SetParameters, "/safety_sensors/set_parameters"
             ),
         }
@@ -271,6 +312,14 @@ class ScanContext(py_trees.behaviour.Behaviour):
             self._send_set_parameter_request(value=self.cached_context)
             # don't worry about the response, no chance to catch it anyway
 
+    def shutdown(self):
+        """Release the parameter clients if they are shared."""
+        self.logger.debug("%s.shutdown()" % self.__class__.__name__)
+        if self.pool is not None:
+            for client in self.parameter_clients.values():
+                self.pool.release(client)
+        self.parameter_clients = {}
+
     def _send_get_parameter_request(self):
         request = rcl_srvs.GetParameters.Request()  # noqa
         request.names.append("enabled")
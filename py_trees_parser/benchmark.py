@@ -0,0 +1,499 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module for benchmarking the tick cost of a parsed behavior tree.
+
+The tree is parsed with `BTParser`, set up against a `FakeNode` that stands in for a ROS node and
+ticked in a headless loop. The fake node hands out publishers, subscriptions, clients and
+services that do not touch the ROS graph, so the numbers are repeatable and only reflect the
+cost of the tree itself.
+
+It can be run as a command:
+
+    ros2 run py_trees_parser py_trees_parser_benchmark tree.xml --ticks 1000
+"""
+
+import argparse
+import contextlib
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import py_trees
+from rclpy import logging
+
+from py_trees_parser.parser import BTParser
+
+
+class FakeFuture:
+    """
+    A stand-in for `rclpy.task.Future`.
+
+    Args:
+    ----
+        result (Any, optional): The result of the future, the future never completes if None.
+
+    """
+
+    def __init__(self, result: Any = None):
+        """Initialize the FakeFuture."""
+        self._result = result
+        self._callbacks = []
+
+    def done(self) -> bool:
+        """Whether the future has completed."""
+        return self._result is not None
+
+    def result(self) -> Any:
+        """Retrieve the result of the future."""
+        return self._result
+
+    def exception(self) -> Exception | None:
+        """Retrieve the exception of the future, which is always None."""
+        return None
+
+    def cancel(self) -> None:
+        """Cancel the future, which is a no-op."""
+        pass
+
+    def cancelled(self) -> bool:
+        """Whether the future was cancelled, which is always False."""
+        return False
+
+    def add_done_callback(self, callback: Callable) -> None:
+        """Add a callback, called immediately if the future has completed."""
+        if self.done():
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+
+class FakePublisher:
+    """A stand-in for `rclpy.publisher.Publisher` that counts the published messages."""
+
+    def __init__(self, msg_type: Any, topic: str, qos_profile: Any = None):
+        """Initialize the FakePublisher."""
+        self.msg_type = msg_type
+        self.topic = topic
+        self.qos_profile = qos_profile
+        self.published = 0
+
+    def publish(self, msg: Any) -> None:
+        """Count the message instead of publishing it."""
+        self.published += 1
+
+    def get_subscription_count(self) -> int:
+        """Retrieve the number of subscriptions, which is always zero."""
+        return 0
+
+    def destroy(self) -> None:
+        """Destroy the publisher, which is a no-op."""
+        pass
+
+
+class FakeSubscription:
+    """A stand-in for `rclpy.subscription.Subscription` that never receives messages."""
+
+    def __init__(self, msg_type: Any, topic: str, callback: Callable, qos_profile: Any = None):
+        """Initialize the FakeSubscription."""
+        self.msg_type = msg_type
+        self.topic = topic
+        self.callback = callback
+        self.qos_profile = qos_profile
+
+    def destroy(self) -> None:
+        """Destroy the subscription, which is a no-op."""
+        pass
+
+
+class FakeClient:
+    """
+    A stand-in for `rclpy.client.Client` whose calls complete immediately.
+
+    Args:
+    ----
+        srv_type (Any): The service type.
+        srv_name (str): The service name.
+        responder (Callable, optional): Creates the response from a request, defaults to an
+            empty response of the service type.
+
+    """
+
+    def __init__(self, srv_type: Any, srv_name: str, responder: Callable | None = None):
+        """Initialize the FakeClient."""
+        self.srv_type = srv_type
+        self.srv_name = srv_name
+        self.responder = responder or (lambda request: srv_type.Response())
+        self.calls = 0
+
+    def wait_for_service(self, timeout_sec: float | None = None) -> bool:
+        """Wait for the service, which is always available."""
+        return True
+
+    def service_is_ready(self) -> bool:
+        """Whether the service is available, which is always True."""
+        return True
+
+    def call_async(self, request: Any) -> FakeFuture:
+        """Call the service, completing immediately with the response of the responder."""
+        self.calls += 1
+        return FakeFuture(self.responder(request))
+
+    def destroy(self) -> None:
+        """Destroy the client, which is a no-op."""
+        pass
+
+
+class FakeService:
+    """A stand-in for `rclpy.service.Service` that is never called."""
+
+    def __init__(self, srv_type: Any, srv_name: str, callback: Callable):
+        """Initialize the FakeService."""
+        self.srv_type = srv_type
+        self.srv_name = srv_name
+        self.callback = callback
+
+    def destroy(self) -> None:
+        """Destroy the service, which is a no-op."""
+        pass
+
+
+class FakeActionClient:
+    """A stand-in for `rclpy.action.ActionClient` whose goals stay pending."""
+
+    def __init__(self, node: Any, action_type: Any, action_name: str, **kwargs):
+        """Initialize the FakeActionClient."""
+        self.node = node
+        self.action_type = action_type
+        self.action_name = action_name
+        self.goals = 0
+
+    def wait_for_server(self, timeout_sec: float | None = None) -> bool:
+        """Wait for the action server, which is always available."""
+        return True
+
+    def server_is_ready(self) -> bool:
+        """Whether the action server is available, which is always True."""
+        return True
+
+    def send_goal_async(self, goal: Any, feedback_callback: Callable | None = None) -> FakeFuture:
+        """Send a goal, which is never accepted nor rejected."""
+        self.goals += 1
+        return FakeFuture()
+
+    def destroy(self) -> None:
+        """Destroy the action client, which is a no-op."""
+        pass
+
+
+def get_bool_parameters(request: Any) -> Any:
+    """Respond to a `rcl_interfaces.srv.GetParameters` request with a False bool per name."""
+    import rcl_interfaces.msg as rcl_msgs
+    import rcl_interfaces.srv as rcl_srvs
+
+    return rcl_srvs.GetParameters.Response(
+        values=[
+            rcl_msgs.ParameterValue(type=rcl_msgs.ParameterType.PARAMETER_BOOL, bool_value=False)
+            for _ in request.names
+        ]
+    )
+
+
+def set_parameters(request: Any) -> Any:
+    """Respond to a `rcl_interfaces.srv.SetParameters` request by accepting every parameter."""
+    import rcl_interfaces.msg as rcl_msgs
+    import rcl_interfaces.srv as rcl_srvs
+
+    return rcl_srvs.SetParameters.Response(
+        results=[rcl_msgs.SetParametersResult(successful=True) for _ in request.parameters]
+    )
+
+
+class FakeNode:
+    """
+    A stand-in for `rclpy.node.Node` that can be passed to `setup(node=...)` of ROS behaviors.
+
+    The parameter services of the safety sensors, used by `ScanContext`, respond with bool
+    parameters by default.
+
+    Args:
+    ----
+        name (str, optional): The name of the node.
+        responders (dict, optional): Callables creating service responses from requests, keyed
+            by service name, in addition to the default ones.
+
+    """
+
+    DEFAULT_RESPONDERS = {
+        "/safety_sensors/get_parameters": get_bool_parameters,
+        "/safety_sensors/set_parameters": set_parameters,
+    }
+
+    def __init__(self, name: str = "benchmark", responders: dict | None = None):
+        """Initialize the FakeNode."""
+        self.name = name
+        self.responders = {**self.DEFAULT_RESPONDERS, **(responders or {})}
+        self.publishers = []
+        self.subscriptions = []
+        self.clients = []
+        self.services = []
+
+    def get_name(self) -> str:
+        """Retrieve the name of the node."""
+        return self.name
+
+    def get_logger(self) -> Any:
+        """Retrieve the logger of the node."""
+        return logging.get_logger(self.name)
+
+    def create_publisher(self, msg_type: Any, topic: str, qos_profile: Any = None, **kwargs):
+        """Create a fake publisher."""
+        publisher = FakePublisher(msg_type, topic, qos_profile)
+        self.publishers.append(publisher)
+        return publisher
+
+    def create_subscription(
+        self, msg_type: Any, topic: str, callback: Callable, qos_profile: Any = None, **kwargs
+    ):
+        """Create a fake subscription."""
+        subscription = FakeSubscription(msg_type, topic, callback, qos_profile)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def create_client(self, srv_type: Any, srv_name: str, **kwargs):
+        """Create a fake client, responding through the responder registered for its name."""
+        client = FakeClient(srv_type, srv_name, self.responders.get(srv_name))
+        self.clients.append(client)
+        return client
+
+    def create_service(self, srv_type: Any, srv_name: str, callback: Callable, **kwargs):
+        """Create a fake service."""
+        service = FakeService(srv_type, srv_name, callback)
+        self.services.append(service)
+        return service
+
+    def destroy_publisher(self, publisher: FakePublisher) -> bool:
+        """Destroy a fake publisher."""
+        self.publishers.remove(publisher)
+        return True
+
+    def destroy_subscription(self, subscription: FakeSubscription) -> bool:
+        """Destroy a fake subscription."""
+        self.subscriptions.remove(subscription)
+        return True
+
+    def destroy_client(self, client: FakeClient) -> bool:
+        """Destroy a fake client."""
+        self.clients.remove(client)
+        return True
+
+    def destroy_service(self, service: FakeService) -> bool:
+        """Destroy a fake service."""
+        self.services.remove(service)
+        return True
+
+
+@contextlib.contextmanager
+def ros_stand_ins():
+    """Replace `rclpy.action.ActionClient` by `FakeActionClient` within the context."""
+    import rclpy.action
+
+    action_client = rclpy.action.ActionClient
+    rclpy.action.ActionClient = FakeActionClient
+    try:
+        yield
+    finally:
+        rclpy.action.ActionClient = action_client
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    The result of a tick benchmark.
+
+    Attributes:
+    ----------
+        file (str): The XML file of the tree.
+        nodes (int): The number of nodes in the tree.
+        ticks (int): The number of measured ticks.
+        parse_time (float): The time in seconds to parse the tree.
+        setup_time (float): The time in seconds to set up the tree.
+        latencies (list[float]): The duration in seconds of every measured tick.
+        peak_bytes (list[int]): The peak memory in bytes allocated during every measured tick.
+        retained_blocks (float): The mean number of memory blocks retained per tick.
+
+    """
+
+    file: str
+    nodes: int
+    ticks: int
+    parse_time: float
+    setup_time: float
+    latencies: list = field(default_factory=list, repr=False)
+    peak_bytes: list = field(default_factory=list, repr=False)
+    retained_blocks: float = 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Compute a percentile of the tick latency.
+
+        Args:
+        ----
+            percent (float): The percentile, between 0 and 100.
+
+        Returns:
+        -------
+            The tick latency in seconds.
+
+        """
+        latencies = sorted(self.latencies)
+        index = min(round(percent / 100 * (len(latencies) - 1)), len(latencies) - 1)
+        return latencies[index]
+
+    def summary(self) -> dict:
+        """
+        Summarize the benchmark.
+
+        Returns:
+        -------
+            A dictionary with the tick latency percentiles in microseconds and the mean
+            allocations per tick.
+
+        """
+        summary = asdict(self)
+        del summary["latencies"]
+        del summary["peak_bytes"]
+        for percent in (50, 90, 99, 100):
+            summary[f"p{percent}_us"] = self.percentile(percent) * 1e6
+        summary["mean_us"] = statistics.fmean(self.latencies) * 1e6
+        summary["mean_peak_bytes"] = statistics.fmean(self.peak_bytes) if self.peak_bytes else 0
+
+        return summary
+
+
+def run_benchmark(
+    file: str,
+    ticks: int = 1000,
+    warmup: int = 10,
+    target: str | None = None,
+    node: FakeNode | None = None,
+    trace_allocations: bool = True,
+) -> BenchmarkResult:
+    """
+    Parse a tree, set it up against a fake ROS node and tick it in a loop.
+
+    The latencies are measured in a first pass, the allocations in a second pass so that memory
+    tracing does not distort the latencies.
+
+    Args:
+    ----
+        file (str): The XML file of the tree.
+        ticks (int, optional): The number of ticks to measure.
+        warmup (int, optional): The number of ticks before measuring.
+        target (str, optional): Only benchmark the subtree rooted at this node, see
+            `BTParser.parse`.
+        node (FakeNode, optional): The node to set up the tree with, e.g. with responders for
+            its services.
+        trace_allocations (bool, optional): Measure the allocations per tick.
+
+    Returns:
+    -------
+        The benchmark result.
+
+    Raises:
+    ------
+        ValueError: If fewer than one tick is measured.
+
+    """
+    if ticks < 1:
+        raise ValueError(f"At least one tick must be measured, got {ticks}")
+
+    start = time.perf_counter()
+    root = BTParser(file).parse(target=target)
+    parse_time = time.perf_counter() - start
+
+    tree = py_trees.trees.BehaviourTree(root=root)
+    start = time.perf_counter()
+    with ros_stand_ins():
+        tree.setup(node=node or FakeNode())
+    setup_time = time.perf_counter() - start
+
+    result = BenchmarkResult(
+        file=file,
+        nodes=len(list(root.iterate())),
+        ticks=ticks,
+        parse_time=parse_time,
+        setup_time=setup_time,
+    )
+
+    for _ in range(warmup):
+        tree.tick()
+
+    for _ in range(ticks):
+        start = time.perf_counter()
+        tree.tick()
+        result.latencies.append(time.perf_counter() - start)
+
+    if trace_allocations:
+        tracemalloc.start()
+        blocks = sys.getallocatedblocks()
+        for _ in range(ticks):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            tree.tick()
+            _, peak = tracemalloc.get_traced_memory()
+            result.peak_bytes.append(peak - before)
+        result.retained_blocks = (sys.getallocatedblocks() - blocks) / ticks
+        tracemalloc.stop()
+
+    tree.shutdown()
+
+    return result
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Benchmark the tick cost of a behavior tree.")
+    parser.add_argument("file", help="the XML file of the tree")
+    parser.add_argument("--ticks", type=int, default=1000, help="the number of measured ticks")
+    parser.add_argument("--warmup", type=int, default=10, help="the number of warmup ticks")
+    parser.add_argument("--target", help="only benchmark the subtree rooted at this node")
+    parser.add_argument("--no-allocations", action="store_true", help="skip memory tracing")
+    parser.add_argument("--json", action="store_true", help="print the summary as json")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(
+        args.file,
+        ticks=args.ticks,
+        warmup=args.warmup,
+        target=args.target,
+        trace_allocations=not args.no_allocations,
+    )
+
+    summary = result.summary()
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        for key, value in summary.items():
+            print(f"{key:>16}: {value:.3f}" if isinstance(value, float) else f"{key:>16}: {value}")
+
+
+if __name__ == "__main__":
+    main()
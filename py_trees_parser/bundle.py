@@ -0,0 +1,295 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module for packing a behavior tree and all of its subtrees into a single bundle file.
+
+A bundle is a zip archive with the root XML file, every file it includes, directly or
+transitively, and a manifest. `BTParser` detects a bundle by its contents, reads it with a single
+open and resolves all includes inside the bundle instead of on the filesystem:
+
+    ros2 run py_trees_parser py_trees_parser_bundle tree.xml mission.btz
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import zipfile
+from dataclasses import dataclass, field
+
+from py_trees_parser.parser import BTParseError, BTParser
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+ZIP_MAGIC = b"PK\x03\x04"
+
+
+class BundleError(BTParseError):
+    """Exception raised when a bundle is malformed or cannot be packed."""
+
+    pass
+
+
+def is_bundle(data: bytes) -> bool:
+    """
+    Check if the contents of a file are a bundle rather than XML.
+
+    Args:
+    ----
+        data (bytes): The contents of the file.
+
+    Returns:
+    -------
+        True if the contents are a zip archive, False otherwise.
+
+    """
+    return data.startswith(ZIP_MAGIC)
+
+
+def _digest(files: dict[str, bytes]) -> str:
+    """Compute a single hash over the names and contents of all files in a bundle."""
+    sha = hashlib.sha256()
+    for member in sorted(files):
+        sha.update(f"{member}\0{hashlib.sha256(files[member]).hexdigest()}\n".encode())
+
+    return sha.hexdigest()
+
+
+@dataclass
+class Bundle:
+    """
+    A behavior tree and all of its subtrees, loaded in memory.
+
+    Files in the bundle are addressed by a virtual path, the path of the bundle file joined with
+    the name of the member, so they can be used wherever the parser expects a file path.
+
+    Attributes:
+    ----------
+        path (str): The real path of the bundle file.
+        root (str): The member holding the root XML file.
+        files (dict[str, bytes]): The contents of every XML file, keyed by member.
+        includes (dict[str, str]): The member of every include attribute in the bundle, keyed by
+            the attribute after argument substitution.
+        sources (dict[str, str]): The member of every file, keyed by its path when packed.
+        digest (str): The sha256 hex digest of all files in the bundle.
+
+    """
+
+    path: str
+    root: str
+    files: dict = field(default_factory=dict)
+    includes: dict = field(default_factory=dict)
+    sources: dict = field(default_factory=dict)
+    digest: str = ""
+
+    @classmethod
+    def from_bytes(cls, path: str, data: bytes) -> "Bundle":
+        """
+        Load a bundle from the contents of a bundle file and verify its integrity.
+
+        Args:
+        ----
+            path (str): The path of the bundle file.
+            data (bytes): The contents of the bundle file.
+
+        Returns:
+        -------
+            The bundle.
+
+        Raises:
+        ------
+            BundleError: If the bundle is malformed or its digest does not match its contents.
+
+        """
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                manifest = json.loads(archive.read(MANIFEST))
+                files = {member: archive.read(member) for member in manifest["files"]}
+        except (zipfile.BadZipFile, KeyError, ValueError) as ex:
+            raise BundleError(f"Malformed bundle {path}: {ex}") from ex
+
+        if manifest.get("version") != FORMAT_VERSION:
+            raise BundleError(f"Unsupported bundle version in {path}: {manifest.get('version')}")
+
+        digest = _digest(files)
+        expected = manifest.get("digest")
+        if digest != expected:
+            raise BundleError(f"Bundle {path} is corrupt: digest {digest} != {expected}")
+
+        return cls(
+            path=os.path.realpath(path),
+            root=manifest["root"],
+            files=files,
+            includes=manifest["includes"],
+            sources=manifest["sources"],
+            digest=digest,
+        )
+
+    def path_of(self, member: str) -> str:
+        """
+        Retrieve the virtual path of a member.
+
+        Args:
+        ----
+            member (str): The name of the member.
+
+        Returns:
+        -------
+            The virtual path of the member.
+
+        """
+        return os.path.join(self.path, member)
+
+    def resolve(self, include: str, path: str | None = None) -> str | None:
+        """
+        Resolve a subtree include to the virtual path of a file in the bundle.
+
+        Args:
+        ----
+            include (str): The include attribute after argument substitution.
+            path (str, optional): The include resolved on the filesystem, used when the include
+                attribute is not known to the bundle.
+
+        Returns:
+        -------
+            The virtual path of the included file, or None if it is not in the bundle.
+
+        """
+        member = self.includes.get(include)
+        if member is None and path is not None:
+            path = os.path.realpath(path)
+            member = self.sources.get(path) or self._member(path)
+
+        return None if member is None else self.path_of(member)
+
+    def read(self, path: str) -> bytes | None:
+        """
+        Read a file from the bundle.
+
+        Args:
+        ----
+            path (str): The virtual path of the file.
+
+        Returns:
+        -------
+            The contents of the file, or None if it is not in the bundle.
+
+        """
+        member = self._member(path)
+        return None if member is None else self.files[member]
+
+    def _member(self, path: str) -> str | None:
+        """Retrieve the member at a virtual path, if any."""
+        if not path.startswith(self.path + os.sep):
+            return None
+        member = os.path.relpath(path, self.path).replace(os.sep, "/")
+        return member if member in self.files else None
+
+
+def pack(file: str, bundle_file: str, all_branches: bool = False) -> Bundle:
+    """
+    Pack a behavior tree XML file and every file it includes into a bundle.
+
+    The includes are resolved the same way `BTParser.include_graph()` does, so only the include
+    attributes and arguments of subtrees are evaluated. Other files referenced by the tree, such
+    as $array() files, are not packed.
+
+    Args:
+    ----
+        file (str): The path of the root XML file.
+        bundle_file (str): The path of the bundle file to write.
+        all_branches (bool, optional): Also pack the includes of branches skipped by their if or
+            unless condition, so the bundle serves every variant of the tree. Every include must
+            then resolve to an existing file.
+
+    Returns:
+    -------
+        The packed bundle.
+
+    Raises:
+    ------
+        BundleError: If the same include attribute resolves to different files.
+        IncludeCycleError: If the subtree includes form a cycle.
+
+    """
+    graph = BTParser(file).include_graph(all_branches=all_branches)
+    base = os.path.commonpath([os.path.dirname(path) for path in graph.files])
+    sources = {
+        path: os.path.relpath(path, base).replace(os.sep, "/") for path in sorted(graph.files)
+    }
+
+    includes = {}
+    for edge in graph.edges:
+        member = sources[edge.target]
+        if includes.setdefault(edge.include, member) != member:
+            raise BundleError(
+                f"Include {edge.include} resolves to both {includes[edge.include]} and {member}"
+            )
+
+    files = {}
+    for path, member in sources.items():
+        with open(path, "rb") as f:
+            files[member] = f.read()
+
+    bundle = Bundle(
+        path=os.path.realpath(bundle_file),
+        root=sources[graph.root],
+        files=files,
+        includes=includes,
+        sources=sources,
+        digest=_digest(files),
+    )
+    manifest = {
+        "version": FORMAT_VERSION,
+        "root": bundle.root,
+        "files": sorted(files),
+        "includes": includes,
+        "sources": sources,
+        "digest": bundle.digest,
+    }
+
+    with zipfile.ZipFile(bundle_file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(MANIFEST, json.dumps(manifest, indent=2))
+        for member, data in files.items():
+            archive.writestr(member, data)
+
+    return bundle
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Pack a bundle from the command line and print its digest."""
+    parser = argparse.ArgumentParser(
+        description="Pack a behavior tree and all of its subtrees into a single bundle file."
+    )
+    parser.add_argument("file", help="the root XML file of the tree")
+    parser.add_argument("bundle", help="the bundle file to write")
+    parser.add_argument(
+        "--all-branches",
+        action="store_true",
+        help="also pack the includes of branches skipped by their if or unless condition",
+    )
+    args = parser.parse_args(argv)
+
+    bundle = pack(args.file, args.bundle, all_branches=args.all_branches)
+
+    for member in sorted(bundle.files):
+        print(f"  {member}")
+    print(f"packed {len(bundle.files)} file(s) into {args.bundle}")
+    print(f"digest: {bundle.digest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module describing the include graph of a behavior tree XML file.
+
+The graph is computed by `BTParser.include_graph()` and contains every file a tree depends on,
+the subtree includes between them and a content hash per file.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class IncludeEdge:
+    """
+    A subtree include from one XML file to another.
+
+    Attributes:
+    ----------
+        source (str): The path of the including file.
+        target (str): The path of the included file.
+        name (str): The name of the subtree node.
+        args (dict[str, str]): The arguments declared on the subtree node.
+        include (str | None): The include attribute of the subtree node after argument
+            substitution.
+
+    """
+
+    source: str
+    target: str
+    name: str | None
+    args: dict = field(default_factory=dict, hash=False)
+    include: str | None = field(default=None, compare=False)
+
+
+@dataclass
+class IncludeGraph:
+    """
+    The include graph of a behavior tree.
+
+    Attributes:
+    ----------
+        root (str): The path of the root XML file.
+        files (dict[str, str]): The sha256 hash of every file in the graph, keyed by path.
+        edges (list[IncludeEdge]): The subtree includes between the files.
+
+    """
+
+    root: str
+    files: dict = field(default_factory=dict)
+    edges: list = field(default_factory=list)
+
+    def includes(self, file: str) -> list[str]:
+        """
+        Retrieve the files directly included by a file.
+
+        Args:
+        ----
+            file (str): The path of the including file.
+
+        Returns:
+        -------
+            The paths of the included files, without duplicates.
+
+        """
+        return list(dict.fromkeys(edge.target for edge in self.edges if edge.source == file))
+
+    def dependencies(self, file: str | None = None) -> set[str]:
+        """
+        Retrieve all files a file depends on, directly or transitively.
+
+        Args:
+        ----
+            file (str, optional): The path of the file, defaults to the root file.
+
+        Returns:
+        -------
+            The paths of the files the file depends on, excluding the file itself.
+
+        """
+        if file is None:
+            file = self.root
+
+        found = set()
+        pending = [file]
+        while pending:
+            for include in self.includes(pending.pop()):
+                if include not in found:
+                    found.add(include)
+                    pending.append(include)
+
+        found.discard(file)
+        return found
+
+    @property
+    def digest(self) -> str:
+        """
+        Compute a single hash over all files in the graph.
+
+        The hash changes whenever any file in the graph is renamed or its contents change, so
+        it can be used as a cache key for the whole tree.
+
+        Returns:
+        -------
+            The sha256 hex digest of the graph.
+
+        """
+        sha = hashlib.sha256()
+        for path in sorted(self.files):
+            sha.update(f"{path}\0{self.files[path]}\n".encode())
+
+        return sha.hexdigest()
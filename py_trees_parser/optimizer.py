@@ -0,0 +1,254 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module for rewriting an expanded XML tree into a cheaper but equivalent tree.
+
+The optimizer is applied by `BTParser.parse(optimize=True)` after all subtrees are included and
+before any behavior is constructed. Every pass removes nodes that do not change the outcome of a
+tick, at the cost of those nodes no longer showing up in e.g. tree visualisations:
+
+* pass-through decorators are replaced by their child,
+* sequences (selectors) directly inside a sequence (selector) with the same memory setting are
+  merged into their parent,
+* runs of sibling `CheckBlackboardVariableValue` nodes in a sequence (selector) are fused into a
+  single `FusedBlackboardCheck` that requires all (any) of the checks to succeed,
+* sequences and selectors with a single child, e.g. a single fused check, are replaced by that
+  child.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from xml.etree.ElementTree import Element
+
+from py_trees_parser import registry
+from py_trees_parser.parser import is_code
+
+SEQUENCE = "py_trees.composites.Sequence"
+SELECTOR = "py_trees.composites.Selector"
+PASS_THROUGH = "py_trees.decorators.PassThrough"
+CHECK = "py_trees.behaviours.CheckBlackboardVariableValue"
+FUSED_CHECK = "py_trees_parser.behaviors.conditions.FusedBlackboardCheck"
+
+
+@dataclass(frozen=True)
+class Rewrite:
+    """
+    A rewrite performed by the optimizer.
+
+    Attributes:
+    ----------
+        rule (str): The name of the pass that performed the rewrite.
+        node (str): The name of the node that was removed.
+        parent (str | None): The name of the node that took its place, if any.
+
+    """
+
+    rule: str
+    node: str
+    parent: str | None = None
+
+    def __str__(self) -> str:
+        """Describe the rewrite."""
+        if self.parent is None:
+            return f"{self.rule}: removed '{self.node}'"
+        return f"{self.rule}: merged '{self.node}' into '{self.parent}'"
+
+
+def _node_type(xml_node: Element) -> str:
+    """Retrieve the fully qualified type of a node without importing it."""
+    return registry.qualified_name(xml_node.tag) or xml_node.tag
+
+
+def _memory(xml_node: Element) -> str | None:
+    """Retrieve the raw memory attribute of a node."""
+    memory = xml_node.attrib.get("memory")
+    return None if memory is None else memory.strip()
+
+
+def drop_pass_through(xml_node: Element, rewrites: list) -> Element:
+    """
+    Replace a pass-through decorator by its child.
+
+    Args:
+    ----
+        xml_node (Element): The node to rewrite.
+        rewrites (list[Rewrite]): The list to record the rewrite in.
+
+    Returns:
+    -------
+        The rewritten node.
+
+    """
+    if _node_type(xml_node) == PASS_THROUGH and len(xml_node) == 1:
+        rewrites.append(Rewrite("drop_pass_through", xml_node.attrib.get("name")))
+        return xml_node[0]
+
+    return xml_node
+
+
+def collapse_nested(xml_node: Element, rewrites: list) -> Element:
+    """
+    Merge sequences (selectors) into a parent sequence (selector) with the same memory setting.
+
+    Args:
+    ----
+        xml_node (Element): The node to rewrite.
+        rewrites (list[Rewrite]): The list to record the rewrites in.
+
+    Returns:
+    -------
+        The rewritten node.
+
+    """
+    node_type = _node_type(xml_node)
+    if node_type not in (SEQUENCE, SELECTOR) or _memory(xml_node) is None:
+        return xml_node
+
+    name = xml_node.attrib.get("name")
+    children = []
+    for child_xml in xml_node:
+        if _node_type(child_xml) == node_type and _memory(child_xml) == _memory(xml_node):
+            rewrites.append(Rewrite("collapse_nested", child_xml.attrib.get("name"), name))
+            children.extend(child_xml)
+        else:
+            children.append(child_xml)
+
+    xml_node[:] = children
+    return xml_node
+
+
+def inline_single_child(xml_node: Element, rewrites: list) -> Element:
+    """
+    Replace a sequence or selector with a single child by that child.
+
+    Args:
+    ----
+        xml_node (Element): The node to rewrite.
+        rewrites (list[Rewrite]): The list to record the rewrite in.
+
+    Returns:
+    -------
+        The rewritten node.
+
+    """
+    if _node_type(xml_node) in (SEQUENCE, SELECTOR) and len(xml_node) == 1:
+        rewrites.append(Rewrite("inline_single_child", xml_node.attrib.get("name")))
+        return xml_node[0]
+
+    return xml_node
+
+
+def _fuse(checks: list[Element], require_all: bool) -> Element:
+    """Create a fused check node from a run of check nodes."""
+    separator = " & " if require_all else " | "
+    expressions = ", ".join(check.attrib["check"].strip()[2:-1] for check in checks)
+
+    return Element(
+        FUSED_CHECK,
+        {
+            "name": separator.join(check.attrib.get("name", "") for check in checks),
+            "checks": f"$([{expressions}])",
+            "require_all": f"$({require_all})",
+        },
+    )
+
+
+def fuse_conditions(xml_node: Element, rewrites: list) -> Element:
+    """
+    Fuse runs of sibling blackboard checks in a sequence or selector into a single check.
+
+    Only checks whose check attribute is a $() expression are fused.
+
+    Args:
+    ----
+        xml_node (Element): The node to rewrite.
+        rewrites (list[Rewrite]): The list to record the rewrites in.
+
+    Returns:
+    -------
+        The rewritten node.
+
+    """
+    node_type = _node_type(xml_node)
+    if node_type not in (SEQUENCE, SELECTOR):
+        return xml_node
+
+    children = []
+    run = []
+    for child_xml in [*xml_node, None]:
+        if (
+            child_xml is not None
+            and _node_type(child_xml) == CHECK
+            and is_code(child_xml.attrib.get("check", "").strip())
+        ):
+            run.append(child_xml)
+            continue
+
+        if len(run) > 1:
+            fused = _fuse(run, require_all=node_type == SEQUENCE)
+            for check in run:
+                rewrites.append(
+                    Rewrite("fuse_conditions", check.attrib.get("name"), fused.attrib["name"])
+                )
+            children.append(fused)
+        else:
+            children.extend(run)
+        run = []
+
+        if child_xml is not None:
+            children.append(child_xml)
+
+    xml_node[:] = children
+    return xml_node
+
+
+# fuse_conditions rewrites the children in place, so it runs before inline_single_child
+PASSES = (drop_pass_through, collapse_nested, fuse_conditions, inline_single_child)
+
+
+def optimize(
+    xml_node: Element, passes: tuple[Callable, ...] = PASSES
+) -> tuple[Element, list[Rewrite]]:
+    """
+    Rewrite an expanded XML tree, bottom up, into a cheaper but equivalent tree.
+
+    Args:
+    ----
+        xml_node (Element): The root of the tree, which must not contain any subtree nodes.
+        passes (tuple[Callable], optional): The passes to apply to every node, in order.
+
+    Returns:
+    -------
+        A tuple containing the root of the rewritten tree and the rewrites performed.
+
+    """
+    rewrites = []
+    return _optimize(xml_node, passes, rewrites), rewrites
+
+
+def _optimize(xml_node: Element, passes: tuple, rewrites: list) -> Element:
+    xml_node[:] = [_optimize(child_xml, passes, rewrites) for child_xml in xml_node]
+
+    return _apply(xml_node, passes, rewrites)
+
+
+def _apply(xml_node: Element, passes: tuple, rewrites: list) -> Element:
+    for optimization in passes:
+        rewritten = optimization(xml_node, rewrites)
+        if rewritten is not xml_node:
+            # the children of the replacement are optimized already, but it may be rewritten again
+            return _apply(rewritten, passes, rewrites)
+
+    return xml_node
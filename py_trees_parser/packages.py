@@ -0,0 +1,104 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module for resolving paths inside ROS packages.
+
+Paths can be given as `package://pkg/path/to/file.xml` or `$(find pkg)/path/to/file.xml`. The
+share directories of all packages are looked up once per process and memoized.
+"""
+
+import functools
+import os
+import re
+
+from ament_index_python.packages import get_package_share_directory as ament_share_directory
+from ament_index_python.packages import get_packages_with_prefixes
+
+PACKAGE_SCHEME = "package://"
+FIND_PATTERN = re.compile(r"\$\(find\s+([\w-]+)\s*\)")
+
+
+@functools.cache
+def _share_directories() -> dict[str, str]:
+    """Map every package in the ament index to its share directory."""
+    return {
+        package: os.path.join(prefix, "share", package)
+        for package, prefix in get_packages_with_prefixes().items()
+    }
+
+
+@functools.cache
+def get_package_share_directory(package: str) -> str:
+    """
+    Retrieve the share directory of a package.
+
+    Args:
+    ----
+        package (str): The name of the package.
+
+    Returns:
+    -------
+        The share directory of the package.
+
+    Raises:
+    ------
+        PackageNotFoundError: If the package is not in the ament index.
+
+    """
+    try:
+        return _share_directories()[package]
+    except KeyError:
+        # the package may have been added to the index after the map was built
+        return ament_share_directory(package)
+
+
+def is_package_path(value: str) -> bool:
+    """
+    Check if a string is a path inside a package.
+
+    Args:
+    ----
+        value: The string to check.
+
+    Returns:
+    -------
+        True if the string uses the package:// scheme or $(find pkg), False otherwise.
+
+    """
+    return value.startswith(PACKAGE_SCHEME) or FIND_PATTERN.search(value) is not None
+
+
+def resolve_package_path(value: str) -> str:
+    """
+    Resolve a path inside a package to a filesystem path.
+
+    Args:
+    ----
+        value (str): The path, either package://pkg/path or containing $(find pkg).
+
+    Returns:
+    -------
+        The filesystem path.
+
+    Raises:
+    ------
+        PackageNotFoundError: If the package is not in the ament index.
+
+    """
+    if value.startswith(PACKAGE_SCHEME):
+        package, _, path = value[len(PACKAGE_SCHEME) :].partition("/")
+        return os.path.join(get_package_share_directory(package), path)
+
+    return FIND_PATTERN.sub(lambda match: get_package_share_directory(match.group(1)), value)
@@ -21,9 +21,14 @@ The `BTParser` class has the following methods:
 """
 
 import ast
+import functools
+import hashlib
 import importlib
 import inspect
+import os
+import threading
 import types
+from collections.abc import Callable
 from typing import Any
 from xml.etree import ElementTree
 from xml.etree.ElementTree import Element
@@ -32,6 +37,15 @@ import py_trees
 import rclpy
 from rclpy import logging
 
+from py_trees_parser import registry
+from py_trees_parser.graph import IncludeEdge, IncludeGraph
+from py_trees_parser.packages import is_package_path, resolve_package_path
+from py_trees_parser.resources import ResourcePool
+from py_trees_parser.tree_setup import SetupReport, TreeSetupError, setup_tree
+
+# handles of fully qualified python paths that have already been resolved
+_handle_cache: dict[str, tuple[str, Any]] = {}
+
 
 class BTParseError(Exception):
     """Exception raised when there is an error parsing a behavior tree."""
@@ -39,6 +53,12 @@ class BTParseError(Exception):
     pass
 
 
+class IncludeCycleError(BTParseError):
+    """Exception raised when subtree includes form a cycle."""
+
+    pass
+
+
 def is_float(value: str) -> bool:
     """
     Check if a string can be converted to a float.
@@ -77,6 +97,44 @@ def is_code(value: str) -> bool:
     return value.startswith("$(") and value.endswith(")")
 
 
+def is_array(value: str) -> bool:
+    """
+    Check if a string refers to an array file.
+
+    This will check if a string is surrounded by $array(), which indicates the value should be
+    loaded from a NumPy .npy file.
+
+    Args:
+    ----
+        value: The string to check.
+
+    Returns:
+    -------
+        True if the string refers to an array file, False otherwise.
+
+    """
+    return value.startswith("$array(") and value.endswith(")")
+
+
+def is_deferred(value: str) -> bool:
+    """
+    Check if a string is intended to be code that is evaluated when it is first used.
+
+    This will check if a string is surrounded by $defer(), which indicates it is intended to be
+    code that is evaluated on the first setup() or initialise() of the behavior.
+
+    Args:
+    ----
+        value: The string to check.
+
+    Returns:
+    -------
+        True if the string represents deferred code, False otherwise.
+
+    """
+    return value.startswith("$defer(") and value.endswith(")")
+
+
 def is_arg(value: str) -> bool:
     """
     Check if a string is intended to be an argument.
@@ -138,6 +196,285 @@ def extract_modules(ast_tree: ast.AST) -> list[str]:
     return list(modules)
 
 
+class Deferred:
+    """
+    A thunk that evaluates the code of a $defer() attribute on first use and caches the result.
+
+    Behaviors receive the thunk instead of the value. Thunks stored directly as attributes of a
+    behavior are replaced by their value on its first setup() or initialise(), any other thunk
+    can be resolved by calling it. Parameters that accept a callable should be given a
+    `$(lambda: ...)` instead, as the thunk would be replaced by its value.
+
+    Attributes:
+    ----------
+        code (str): The code to evaluate.
+
+    Args:
+    ----
+        parser (BTParser | None): The parser used to evaluate the code.
+        code (str): The code to evaluate.
+        function (Callable, optional): A function that evaluates the code, used instead of the
+            parser, e.g. by transpiled modules.
+
+    """
+
+    _UNSET = object()
+
+    def __init__(self, parser: "BTParser | None", code: str, function: Callable | None = None):
+        """Initialize the Deferred."""
+        # fail on syntax errors while parsing rather than when the behavior is first used
+        ast.parse(code, mode="eval")
+        self.code = code
+        if function is None:
+            function = functools.partial(parser._parse_code, f"$({code})")
+        self._function = function
+        self._value = self._UNSET
+        self._lock = threading.Lock()
+
+    @property
+    def resolved(self) -> bool:
+        """Whether the code has been evaluated."""
+        return self._value is not self._UNSET
+
+    def __call__(self) -> Any:
+        """Evaluate the code, only on the first call."""
+        if self._value is self._UNSET:
+            with self._lock:
+                if self._value is self._UNSET:
+                    self._value = self._function()
+                    self._function = None
+
+        return self._value
+
+    def __repr__(self) -> str:
+        """Represent the thunk by its code and, once evaluated, its value."""
+        if self.resolved:
+            return f"Deferred({self.code!r} = {self._value!r})"
+        return f"Deferred({self.code!r})"
+
+
+def resolve_deferred(node: py_trees.behaviour.Behaviour) -> None:
+    """
+    Replace the deferred attributes of a behavior by their values.
+
+    Args:
+    ----
+        node (Behaviour): The behavior to resolve the attributes of.
+
+    """
+    for key, value in list(vars(node).items()):
+        if isinstance(value, Deferred):
+            setattr(node, key, value())
+
+    # restore the methods of the class, see bind_deferred
+    for method_name in ("setup", "initialise"):
+        vars(node).pop(method_name, None)
+
+
+def bind_deferred(node: py_trees.behaviour.Behaviour) -> None:
+    """
+    Resolve the deferred attributes of a behavior on its first setup() or initialise().
+
+    Args:
+    ----
+        node (Behaviour): The behavior to bind.
+
+    """
+    if not any(isinstance(value, Deferred) for value in vars(node).values()):
+        return
+
+    def resolving(method):
+        def wrapper(*args, **kwargs):
+            resolve_deferred(node)
+            return method(*args, **kwargs)
+
+        return wrapper
+
+    for method_name in ("setup", "initialise"):
+        setattr(node, method_name, resolving(getattr(node, method_name)))
+
+
+class NodeStrategy:
+    """
+    The way a behavior, composite, decorator or idiom is constructed from XML.
+
+    A strategy is computed once per callable and cached, see `get_strategy`.
+
+    Attributes:
+    ----------
+        obj (Any): The behavior class or idiom function.
+        children_kwarg (str | None): The keyword children are passed with, None if the callable
+            does not take children.
+        single_child (bool): Whether the callable takes a single child instead of a list.
+        children_required (bool): Whether the callable fails without children.
+        accepted (frozenset[str] | None): The accepted attribute names, None if the callable
+            accepts arbitrary keyword arguments.
+        required (frozenset[str]): The attribute names that must be given.
+
+    Args:
+    ----
+        obj (Any): The behavior class or idiom function.
+
+    Raises:
+    ------
+        KeyError: If obj is not a behavior class or a function.
+
+    """
+
+    def __init__(self, obj: Any):
+        """Initialize the NodeStrategy."""
+        is_function = isinstance(obj, types.FunctionType)
+        if not is_function and not (
+            isinstance(obj, type) and issubclass(obj, py_trees.behaviour.Behaviour)
+        ):
+            raise KeyError(
+                f"{obj} was not an expected type (Behavior, Composite, Decorator, Idiom)"
+            )
+
+        self.obj = obj
+        parameters = inspect.signature(obj).parameters
+
+        self.children_kwarg = None
+        if is_function:
+            for kwarg in ("behaviour", "subtrees", "tasks"):
+                if kwarg in parameters:
+                    self.children_kwarg = kwarg
+                    break
+        elif issubclass(obj, py_trees.decorators.Decorator):
+            self.children_kwarg = "child"
+        elif issubclass(obj, py_trees.composites.Composite) or "children" in parameters:
+            self.children_kwarg = "children"
+
+        self.single_child = self.children_kwarg in ("behaviour", "child")
+        children_param = parameters.get(self.children_kwarg)
+        self.children_required = (
+            children_param is not None and children_param.default is inspect.Parameter.empty
+        )
+
+        keywords = {
+            key
+            for key, param in parameters.items()
+            if param.kind not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+        }
+        keywords -= {"name", self.children_kwarg}
+        if any(param.kind == inspect.Parameter.VAR_KEYWORD for param in parameters.values()):
+            self.accepted = None
+        else:
+            self.accepted = frozenset(keywords)
+
+        self.required = frozenset(
+            key for key in keywords if parameters[key].default is inspect.Parameter.empty
+        )
+
+    def check_attributes(self, node_type: str, attribs: dict) -> None:
+        """
+        Check that the attributes of a node match the signature of the callable.
+
+        Args:
+        ----
+            node_type (str): The type of the node, used in error messages.
+            attribs (dict): The attributes of the node, excluding name.
+
+        Raises:
+        ------
+            BTParseError: If an attribute is unknown or a required attribute is missing.
+
+        """
+        if self.accepted is not None:
+            unknown = attribs.keys() - self.accepted
+            if unknown:
+                raise BTParseError(
+                    f"Unknown attribute(s) {sorted(unknown)} for {node_type}, "
+                    f"expected a subset of {sorted(self.accepted)}"
+                )
+
+        missing = self.required - attribs.keys()
+        if missing:
+            raise BTParseError(f"Missing required attribute(s) {sorted(missing)} for {node_type}")
+
+    def children_kwargs(self, name: str, children: list) -> dict:
+        """
+        Map the children of a node to the keyword arguments of the callable.
+
+        Args:
+        ----
+            name (str): The name of the node, used in error messages.
+            children (list): A list of child nodes.
+
+        Returns:
+        -------
+            The keyword arguments to pass the children with, empty if there are no children.
+
+        Raises:
+        ------
+            BTParseError: If the number of children does not match the callable.
+
+        """
+        if len(children) == 0:
+            if self.children_required:
+                raise BTParseError(f"{self.obj.__qualname__} ({name}) requires children")
+
+            return {}
+
+        if self.children_kwarg is None:
+            raise BTParseError(f"{self.obj.__qualname__} ({name}) does not take children")
+
+        if self.single_child:
+            if len(children) > 1:
+                raise BTParseError(
+                    f"{self.obj.__qualname__} ({name}) takes a single child, got {len(children)}"
+                )
+
+            return {self.children_kwarg: children[0]}
+
+        return {self.children_kwarg: children}
+
+    def build(self, name: str, children: list, attribs: dict) -> py_trees.behaviour.Behaviour:
+        """
+        Construct the node.
+
+        Args:
+        ----
+            name (str): The name of the node.
+            children (list): A list of child nodes.
+            attribs (dict): The converted attributes of the node, excluding name.
+
+        Returns:
+        -------
+            The created node.
+
+        Raises:
+        ------
+            BTParseError: If the number of children does not match the callable.
+
+        """
+        return self.obj(name=name, **self.children_kwargs(name, children), **attribs)
+
+
+# construction strategies of the behaviors and idioms that have been created before
+_strategy_cache: dict[Any, NodeStrategy] = {}
+
+
+def get_strategy(obj: Any) -> NodeStrategy:
+    """
+    Retrieve the cached construction strategy of a callable, computing it on first use.
+
+    Args:
+    ----
+        obj (Any): The behavior class or idiom function.
+
+    Returns:
+    -------
+        The construction strategy.
+
+    """
+    try:
+        return _strategy_cache[obj]
+    except KeyError:
+        strategy = _strategy_cache[obj] = NodeStrategy(obj)
+        return strategy
+
+
 class BTParser:
     """
     A parser for behavior trees.
@@ -149,6 +486,9 @@ class BTParser:
     ----------
         file (str): The XML file to parse.
         logger (logging.Logger): A logger for debugging and error messages.
+        rewrites (list[Rewrite]): The rewrites performed by the optimizer in the last parse.
+        bundle (Bundle | None): The bundle loaded by the last parse if the file is a bundle, see
+            `py_trees_parser.bundle`.
 
     Args:
     ----
@@ -164,6 +504,10 @@ class BTParser:
     ):
         """Initialize the BTParser."""
         self.file = file
+        self._include_stack = []
+        self._arrays = {}
+        self.rewrites = []
+        self.bundle = None
 
         self.logger = rclpy.logging.get_logger("BTParser")
         self.logger.set_level(log_level)
@@ -172,6 +516,9 @@ class BTParser:
         """
         Retrieve a handle (i.e., a module or function) from a string.
 
+        The string is either a tag registered in `py_trees_parser.registry` or a fully qualified
+        python path.
+
         Args:
         ----
             value (str): The string to retrieve the handle from.
@@ -189,10 +536,20 @@ class BTParser:
         if value == "":
             return "", None
 
+        handle = registry.lookup_tag(value)
+        if handle is not None:
+            self.logger.debug(f"Found registered tag {value}: {handle = }")
+            return getattr(handle, "__module__", ""), handle
+
+        if value in _handle_cache:
+            return _handle_cache[value]
+
         try:
             module_name, obj_name = value.rsplit(".", 1)
         except ValueError as ex:
-            raise KeyError("Error parsing handle") from ex
+            raise KeyError(
+                f"Error parsing handle {value}, it is neither registered nor a module path"
+            ) from ex
 
         try:
             module = importlib.import_module(module_name)
@@ -202,6 +559,7 @@ class BTParser:
             handle = getattr(handle, obj_name)
 
         self.logger.debug(f"{module_name = }, {obj_name = }, {handle = }")
+        _handle_cache[value] = (module_name, handle)
         return module_name, handle
 
     def _parse_code(self, value: str) -> Any:
@@ -226,6 +584,64 @@ class BTParser:
 
         return value
 
+    def _array_path(self, value: str) -> str:
+        """
+        Resolve the file of a $array() attribute relative to the XML file that is being parsed.
+
+        Args:
+        ----
+            value (str): The attribute of the form $array(path.npy).
+
+        Returns:
+        -------
+            The real path of the file.
+
+        """
+        path = value[len("$array(") : -1].strip()
+        if is_package_path(path):
+            path = resolve_package_path(path)
+        elif not os.path.isabs(path) and len(self._include_stack) > 0:
+            path = os.path.join(os.path.dirname(self._include_stack[-1]), path)
+
+        return os.path.realpath(path)
+
+    def _load_array(self, value: str) -> Any:
+        """
+        Load a NumPy array from a .npy file as a read-only memory map.
+
+        Relative paths are relative to the XML file that is being parsed. All nodes referring to
+        the same file within a parse share the same array.
+
+        Args:
+        ----
+            value (str): The attribute of the form $array(path.npy).
+
+        Returns:
+        -------
+            The memory mapped array.
+
+        Raises:
+        ------
+            BTParseError: If NumPy is not installed.
+
+        """
+        try:
+            import numpy
+        except ImportError as ex:
+            self.logger.error("NumPy is required for $array() attributes")
+            raise BTParseError("NumPy is required for $array() attributes") from ex
+
+        path = self._array_path(value)
+        if path not in self._arrays:
+            self.logger.debug(f"Loading array: {path}")
+            try:
+                self._arrays[path] = numpy.load(path, mmap_mode="r", allow_pickle=False)
+            except FileNotFoundError as ex:
+                self.logger.error(f"Array file {path} not found")
+                raise FileNotFoundError(f"Array file {path} not found") from ex
+
+        return self._arrays[path]
+
     def _string_num_or_code(self, value: str) -> Any:
         """
         Convert a string to either an integer, float, code, or leave it as a string.
@@ -246,6 +662,10 @@ class BTParser:
             value = float(value)
         elif is_code(value):
             value = self._parse_code(value)
+        elif is_array(value):
+            value = self._load_array(value)
+        elif is_deferred(value):
+            value = Deferred(self, value[len("$defer(") : -1])
 
         self.logger.debug(f"Found {type(value)} {value = }")
 
@@ -331,15 +751,12 @@ class BTParser:
         # class and module name as if your were to import the class into
         # python directly
         module_name, obj = self._get_handle(node_type)
-
-        if not isinstance(obj, types.FunctionType) and not (
-            issubclass(obj, py_trees.behaviour.Behaviour)
-            or issubclass(obj, py_trees.composites.Composite)
-            or issubclass(obj, py_trees.decorators.Decorator)
-        ):
+        try:
+            strategy = get_strategy(obj)
+        except KeyError as ex:
             raise KeyError(
                 f"{node_type = } was not an expected type (Behavior, Composite, Decorator, Idiom)"
-            )
+            ) from ex
 
         self.logger.debug(f"Found {module_name = } and {obj = }")
         # name is a special attribute that is handled separately
@@ -348,31 +765,13 @@ class BTParser:
 
         self.logger.debug(f"Found {node_type}")
 
-        # name is a special attribute that is handled separately
+        # reject unexpected attributes before evaluating any of them
+        strategy.check_attributes(node_type, node_attribs)
         node_attribs = self._convert_attribs(node_attribs)
 
         self.logger.debug("Creating node")
-        if isinstance(obj, types.FunctionType):
-            parameters = inspect.signature(obj).parameters
-            if "behaviour" in parameters:
-                node = obj(name=name, behaviour=children[0], **node_attribs)
-            elif "subtrees" in parameters:
-                node = obj(name=name, subtrees=children, **node_attribs)
-            elif "tasks" in parameters:
-                node = obj(name=name, tasks=children, **node_attribs)
-            elif len(children) == 0:
-                node = obj(name=name, **node_attribs)
-            else:
-                self.logger.error(f"Unknown node type {node_type}")
-                raise BTParseError(f"Unknown node type {node_type}")
-
-        elif len(children) == 0:
-            node = obj(name=name, **node_attribs)
-        elif issubclass(obj, py_trees.decorators.Decorator):
-            self.logger.debug(f"{node_attribs = }")
-            node = obj(name=name, child=children[0], **node_attribs)
-        else:
-            node = obj(name=name, children=children, **node_attribs)
+        node = strategy.build(name, children, node_attribs)
+        bind_deferred(node)
 
         return node
 
@@ -406,6 +805,149 @@ class BTParser:
 
         return None
 
+    def _is_enabled(self, xml_node: Element) -> bool:
+        """
+        Evaluate the if and unless attributes of a node and remove them from the node.
+
+        The attributes are evaluated like any other attribute, after argument substitution, and
+        may also be the strings "true" and "false" in any case.
+
+        Args:
+        ----
+            xml_node (Element): The XML node.
+
+        Returns:
+        -------
+            False if the node is skipped by its if or unless condition, True otherwise.
+
+        Raises:
+        ------
+            BTParseError: If a condition is neither code, a number nor "true" or "false".
+
+        """
+        conditions = [(key, xml_node.attrib.pop(key, None)) for key in ("if", "unless")]
+        for key, value in conditions:
+            if value is None:
+                continue
+
+            value = self._string_num_or_code(value)
+            if isinstance(value, str):
+                if value.lower() not in ("true", "false"):
+                    self.logger.error(f"Invalid {key} condition {value!r}, expected true or false")
+                    raise BTParseError(
+                        f"Invalid {key} condition {value!r}, expected true or false"
+                    )
+                value = value.lower() == "true"
+
+            if bool(value) != (key == "if"):
+                self.logger.debug(f"Skipping {xml_node.attrib.get('name')}: {key} {value}")
+                return False
+
+        return True
+
+    def _get_subtree_include(self, xml_node: Element, args: dict) -> tuple[str, dict]:
+        """
+        Resolve the include path and arguments of a subtree node.
+
+        Args:
+        ----
+            xml_node (Element): The subtree XML node.
+            args (dict[str, str]): Arguments available to the subtree node.
+
+        Returns:
+        -------
+            A tuple containing the include path and the arguments declared by the subtree.
+
+        Raises:
+        ------
+            AttributeError: If the subtree contains a tag other than arg.
+
+        """
+        subtree_name = xml_node.attrib.get("name")
+        include = self._resolve_include(xml_node.attrib.get("include"))
+        self.logger.debug(f"Found subtree: {subtree_name}, {include}")
+        new_args = {}
+        for child_xml in xml_node:
+            if child_xml.tag.lower() == "arg":  # create argument dict
+                self._process_args(child_xml, args)
+                name = child_xml.attrib.get("name")
+                new_args[name] = child_xml.attrib.get("value")
+                self.logger.debug(f"Found arg: {name} = {new_args[name]}")
+            else:
+                raise AttributeError(
+                    f"Unexpected tag in subtree ({subtree_name}): {child_xml.tag.lower()}"
+                )
+
+        return include, new_args
+
+    def _resolve_include(self, value: str) -> str:
+        """
+        Resolve the include attribute of a subtree to a file path.
+
+        Includes of the form package://pkg/path and $(find pkg)/path are resolved through the
+        memoized package index without evaluating any code. When parsing a bundle, includes are
+        resolved to files inside the bundle.
+
+        Args:
+        ----
+            value (str): The include attribute.
+
+        Returns:
+        -------
+            The path of the included file.
+
+        Raises:
+        ------
+            BTParseError: If parsing a bundle and the included file is not in the bundle.
+
+        """
+        value = value.strip()
+        if self.bundle is not None:
+            # includes known to the bundle are resolved without evaluating any code
+            include = self.bundle.resolve(value)
+            if include is not None:
+                return include
+
+        include = value
+        if is_package_path(include):
+            include = resolve_package_path(include)
+            self.logger.debug(f"Resolved package path: {include}")
+        include = self._string_num_or_code(include)
+
+        if self.bundle is not None:
+            path = self.bundle.resolve(value, include)
+            if path is None:
+                self.logger.error(f"Include {value} is not in bundle {self.bundle.path}")
+                raise BTParseError(f"Include {value} is not in bundle {self.bundle.path}")
+            return path
+
+        return include
+
+    def _push_include(self, file: str) -> None:
+        """
+        Mark a file as being included, guarding against include cycles.
+
+        Args:
+        ----
+            file (str): The path of the included XML file.
+
+        Raises:
+        ------
+            IncludeCycleError: If the file is already being included further up the tree.
+
+        """
+        path = os.path.realpath(file)
+        if path in self._include_stack:
+            cycle = self._include_stack[self._include_stack.index(path) :] + [path]
+            self.logger.error(f"Include cycle detected: {' -> '.join(cycle)}")
+            raise IncludeCycleError(f"Include cycle detected: {' -> '.join(cycle)}")
+
+        self._include_stack.append(path)
+
+    def _pop_include(self) -> None:
+        """Remove the most recently included file from the include stack."""
+        self._include_stack.pop()
+
     def _build_tree(
         self,
         xml_node: Element,
@@ -421,7 +963,7 @@ class BTParser:
 
         Returns:
         -------
-            The built behavior tree.
+            The built behavior tree, or None if the node is skipped by its if or unless condition.
 
         """
         if args is None:
@@ -434,30 +976,25 @@ class BTParser:
             return None
 
         self._process_args(xml_node, args)
+        # skipped branches are neither included nor constructed
+        if not self._is_enabled(xml_node):
+            return None
 
         if xml_node.tag.lower() == "subtree":
-            subtree_name = xml_node.attrib.get("name")
-            include = self._string_num_or_code(xml_node.attrib.get("include"))
-            self.logger.debug(f"Found subtree: {subtree_name}, {include}")
-            new_args = {}
-            for child_xml in xml_node:
-                if child_xml.tag.lower() == "arg":  # create argument dict
-                    self._process_args(child_xml, args)
-                    name = child_xml.attrib.get("name")
-                    new_args[name] = child_xml.attrib.get("value")
-                    self.logger.debug(f"Found arg: {name} = {new_args[name]}")
-                else:  # no more args so parse subtree
-                    raise AttributeError(
-                        f"Unexpected tag in subtree ({subtree_name}): {child_xml.tag.lower()}"
-                    )
-            return self._build_tree(self._get_xml(include), {**args, **new_args})
+            include, new_args = self._get_subtree_include(xml_node, args)
+            self._push_include(include)
+            try:
+                return self._build_tree(self._get_xml(include), {**args, **new_args})
+            finally:
+                self._pop_include()
 
         # we only need to find children if the node is a composite
         children = list()
         for child_xml in xml_node:
             self._process_args(child_xml, args)
             child = self._build_tree(child_xml, args)
-            children.append(child)
+            if child is not None:
+                children.append(child)
 
         # build the actual node
         node = self._create_node(xml_node.tag, children, xml_node.attrib)
@@ -481,25 +1018,436 @@ class BTParser:
             FileNotFoundError: If the XML file cannot be found.
 
         """
+        root = ElementTree.fromstring(self._read_file(file))
+        return root
+
+    def _read_file(self, file) -> bytes:
+        """
+        Read the raw contents of an XML file, from the loaded bundle if it contains the file.
+
+        Args:
+        ----
+            file (str): The path to the XML file.
+
+        Returns:
+        -------
+            The contents of the file.
+
+        Raises:
+        ------
+            FileNotFoundError: If the XML file cannot be found.
+
+        """
+        if self.bundle is not None:
+            data = self.bundle.read(file)
+            if data is not None:
+                return data
+
         try:
-            with open(file) as f:
-                xml_str = f.read()
+            with open(file, "rb") as f:
+                return f.read()
         except FileNotFoundError as ex:
             self.logger.error(f"XML file {file} not found")
             raise FileNotFoundError(f"XML file {file} not found") from ex
 
-        root = ElementTree.fromstring(xml_str)
-        return root
+    def _iter_subtrees(self, xml_node: Element, args: dict, all_branches: bool = False):
+        """
+        Iterate over the subtree nodes of an XML tree without following the includes.
+
+        Branches skipped by their if or unless condition are not searched, unless all branches
+        are requested.
+
+        Args:
+        ----
+            xml_node (Element): The XML node to search.
+            args (dict[str, str]): Arguments for substitutions in elements.
+            all_branches (bool, optional): Search all branches without evaluating conditions.
+
+        Yields:
+        ------
+            The subtree nodes in document order, with their arguments substituted.
+
+        """
+        self._process_args(xml_node, args)
+        if not all_branches and not self._is_enabled(xml_node):
+            return
+
+        if xml_node.tag.lower() == "subtree":
+            yield xml_node
+            return
+
+        for child_xml in xml_node:
+            yield from self._iter_subtrees(child_xml, args, all_branches)
+
+    def _walk_includes(
+        self, file: str, args: dict, graph: IncludeGraph, visited: set, all_branches: bool
+    ) -> None:
+        """
+        Add a file and everything it includes to an include graph.
+
+        Args:
+        ----
+            file (str): The path of the XML file.
+            args (dict[str, str]): Arguments passed to the file.
+            graph (IncludeGraph): The graph to add the file to.
+            visited (set): The (file, args) pairs that have already been walked.
+            all_branches (bool): Follow the includes of branches skipped by their condition.
+
+        """
+        path = os.path.realpath(file)
+        key = (path, tuple(sorted(args.items())))
+        if key in visited:
+            return
+
+        self._push_include(path)
+        try:
+            if path not in graph.files:
+                graph.files[path] = hashlib.sha256(self._read_file(path)).hexdigest()
+            root = self._get_xml(path)
+            for subtree_xml in self._iter_subtrees(root, args, all_branches):
+                include, new_args = self._get_subtree_include(subtree_xml, args)
+                edge = IncludeEdge(
+                    source=path,
+                    target=os.path.realpath(include),
+                    name=subtree_xml.attrib.get("name"),
+                    args=new_args,
+                    include=subtree_xml.attrib.get("include").strip(),
+                )
+                if edge not in graph.edges:
+                    graph.edges.append(edge)
+                self._walk_includes(include, {**args, **new_args}, graph, visited, all_branches)
+        finally:
+            self._pop_include()
+
+        visited.add(key)
+
+    def include_graph(self, all_branches: bool = False) -> IncludeGraph:
+        """
+        Compute the include graph of the XML file without constructing any behaviors.
+
+        Only the include expressions and arguments of subtrees are evaluated.
+
+        Args:
+        ----
+            all_branches (bool, optional): Also follow the includes of branches that are skipped
+                by their if or unless condition, without evaluating the conditions.
+
+        Returns:
+        -------
+            The include graph rooted at the parsed file.
+
+        Raises:
+        ------
+            IncludeCycleError: If the subtree includes form a cycle.
+
+        """
+        file = self._load_file()[1]
+        graph = IncludeGraph(root=os.path.realpath(file))
+        self._include_stack = []
+        self._walk_includes(file, {}, graph, set(), all_branches)
 
-    def parse(self) -> py_trees.behaviour.Behaviour:
+        return graph
+
+    def _find_target(self, xml_root: Element, target: str, args: dict) -> tuple | None:
+        """
+        Find the target node in an XML document, following includes only if necessary.
+
+        The document itself is searched first, its subtrees are only loaded when the target is not
+        part of the document.
+
+        Args:
+        ----
+            xml_root (Element): The root of the XML document to search.
+            target (str): The name of the node, or an XPath if it starts with "." or "/".
+            args (dict[str, str]): Arguments for substitutions in the document.
+
+        Returns:
+        -------
+            A tuple containing the target node, the arguments in its scope and the include stack
+            of the file it is in, or None if the target could not be found.
+
+        """
+        for xml_node in xml_root.iter():
+            self._process_args(xml_node, args)
+        if not self._prune(xml_root):
+            return None
+
+        if target.startswith((".", "/")):
+            # wrap the root so that paths are relative to the document rather than the root node
+            document = Element("document")
+            document.append(xml_root)
+            match = document.find("." + target if target.startswith("/") else target)
+        else:
+            match = next(
+                (
+                    xml_node
+                    for xml_node in xml_root.iter()
+                    if xml_node.tag.lower() != "arg" and xml_node.attrib.get("name") == target
+                ),
+                None,
+            )
+
+        if match is not None:
+            return match, args, list(self._include_stack)
+
+        for subtree_xml in self._iter_subtrees(xml_root, args):
+            include, new_args = self._get_subtree_include(subtree_xml, args)
+            self._push_include(include)
+            try:
+                found = self._find_target(self._get_xml(include), target, {**args, **new_args})
+            finally:
+                self._pop_include()
+
+            if found is not None:
+                return found
+
+        return None
+
+    def _prune(self, xml_node: Element) -> bool:
+        """
+        Remove the branches of an XML tree that are skipped by their if or unless condition.
+
+        Args:
+        ----
+            xml_node (Element): The XML node to prune, with its arguments substituted.
+
+        Returns:
+        -------
+            False if the node itself is skipped, True otherwise.
+
+        """
+        if not self._is_enabled(xml_node):
+            return False
+
+        xml_node[:] = [child_xml for child_xml in xml_node if self._prune(child_xml)]
+        return True
+
+    def _expand_tree(self, xml_node: Element, args: dict) -> Element | None:
+        """
+        Replace the subtrees in an XML tree by the trees they include.
+
+        Args:
+        ----
+            xml_node (Element): The XML node to expand.
+            args (dict[str, str]): Arguments for substitutions in elements.
+
+        Returns:
+        -------
+            The expanded XML node, or None if the node is skipped by its if or unless condition.
+
+        """
+        self._process_args(xml_node, args)
+        if not self._is_enabled(xml_node):
+            return None
+
+        if xml_node.tag.lower() == "subtree":
+            include, new_args = self._get_subtree_include(xml_node, args)
+            self._push_include(include)
+            try:
+                return self._expand_tree(self._get_xml(include), {**args, **new_args})
+            finally:
+                self._pop_include()
+
+        # the expanded tree no longer tells which file a node came from
+        for key, value in xml_node.attrib.items():
+            if is_array(value.strip()):
+                xml_node.set(key, f"$array({self._array_path(value.strip())})")
+
+        expanded = [self._expand_tree(child_xml, args) for child_xml in list(xml_node)]
+        xml_node[:] = [child_xml for child_xml in expanded if child_xml is not None]
+
+        return xml_node
+
+    def _load_file(self) -> tuple[Element, str]:
+        """
+        Load the parsed file, which is either an XML file or a bundle.
+
+        A bundle is read with a single open and kept in `bundle` until the next load.
+
+        Returns:
+        -------
+            A tuple containing the root element and the path of the root XML file, which is a
+            path inside the bundle when loading a bundle.
+
+        Raises:
+        ------
+            BundleError: If the file is a malformed or corrupt bundle.
+
+        """
+        # the bundle module depends on this module, so it is only imported when needed
+        from py_trees_parser.bundle import Bundle, is_bundle
+
+        self.bundle = None
+        data = self._read_file(self.file)
+        if not is_bundle(data):
+            return ElementTree.fromstring(data), self.file
+
+        self.bundle = Bundle.from_bytes(self.file, data)
+        self.logger.info(
+            f"Loaded bundle {self.file} with {len(self.bundle.files)} file(s), "
+            f"digest {self.bundle.digest}"
+        )
+        file = self.bundle.path_of(self.bundle.root)
+
+        return self._get_xml(file), file
+
+    def _load_root(self, target: str | None = None) -> tuple[Element, dict]:
+        """
+        Load the root element of the XML file, or of the target within it.
+
+        Args:
+        ----
+            target (str, optional): The name or XPath of the node to load, see `parse`.
+
+        Returns:
+        -------
+            A tuple containing the root element and the arguments in its scope.
+
+        Raises:
+        ------
+            BTParseError: If the target could not be found or the root is skipped by its
+                condition.
+
+        """
+        root, file = self._load_file()
+        self._include_stack = [os.path.realpath(file)]
+        args = {}
+
+        if target is not None:
+            found = self._find_target(root, target, args)
+            if found is None:
+                self.logger.error(f"Target {target} not found in {self.file}")
+                raise BTParseError(f"Target {target} not found in {self.file}")
+            # keep the file of the target on the include stack for relative paths
+            root, args, self._include_stack = found
+            self.logger.debug(f"Found target {target}: {root.tag}")
+        elif not self._is_enabled(root):
+            self.logger.error(f"The root of {self.file} is skipped by its condition")
+            raise BTParseError(f"The root of {self.file} is skipped by its condition")
+
+        return root, args
+
+    def expand(self, target: str | None = None) -> Element:
+        """
+        Load the XML file with all subtrees included and all arguments substituted.
+
+        Only the include attributes and arguments of subtrees are evaluated, no behaviors are
+        constructed. The files of $array() attributes are resolved to absolute paths.
+
+        Args:
+        ----
+            target (str, optional): Only expand the subtree rooted at this node, see `parse`.
+
+        Returns:
+        -------
+            The root element of the expanded tree.
+
+        Raises:
+        ------
+            BTParseError: If the target could not be found.
+
+        """
+        root, args = self._load_root(target)
+
+        return self._expand_tree(root, args)
+
+    def parse(
+        self, target: str | None = None, optimize: bool = False
+    ) -> py_trees.behaviour.Behaviour:
         """
         Parse the XML file and build the behavior tree.
 
+        Args:
+        ----
+            target (str, optional): Only build the subtree rooted at this node. The target is
+                either the name of a node or an XPath, which is evaluated against each document in
+                turn, e.g. ".//py_trees.composites.Selector[@name='Tasks']". Includes are only
+                followed until the target is found and nothing outside of the target is built.
+            optimize (bool, optional): Rewrite the tree into a cheaper but equivalent tree before
+                building it, see `py_trees_parser.optimizer`. The rewrites are stored in
+                `rewrites`.
+
+        Returns:
+        -------
+            The built behavior tree. A `ResourcePool` for its behaviors to share ROS entities
+            through is attached to the root as `resource_pool`, see `py_trees_parser.resources`.
+
+        Raises:
+        ------
+            BTParseError: If the target could not be found.
+
+        """
+        self._arrays = {}
+        self.rewrites = []
+        root, args = self._load_root(target)
+
+        if optimize:
+            # the optimizer depends on this module, so it is only imported when needed
+            from py_trees_parser.optimizer import optimize as optimize_tree
+
+            root, self.rewrites = optimize_tree(self._expand_tree(root, args))
+            for rewrite in self.rewrites:
+                self.logger.debug(f"Optimized {rewrite}")
+            self.logger.info(f"Optimizer performed {len(self.rewrites)} rewrite(s)")
+
+        tree = self._build_tree(root, args)
+        tree.resource_pool = ResourcePool()
+
+        return tree
+
+    def parse_and_setup(
+        self,
+        parallel: bool = True,
+        timeout: float | None = None,
+        max_workers: int | None = None,
+        target: str | None = None,
+        optimize: bool = False,
+        **kwargs,
+    ) -> tuple[py_trees.behaviour.Behaviour, SetupReport]:
+        """
+        Parse the XML file, build the behavior tree and set up all of its nodes.
+
+        Args:
+        ----
+            parallel (bool, optional): Set up the nodes concurrently on a pool of threads.
+            timeout (float, optional): The time in seconds a single node's setup may take. A
+                setup that times out cannot be interrupted and keeps running on a daemon thread.
+            max_workers (int, optional): The number of threads.
+            target (str, optional): Only build and set up the subtree rooted at this node, see
+                `parse`.
+            optimize (bool, optional): Optimize the tree before building it, see `parse`.
+            **kwargs: Keyword arguments passed to every node's setup, e.g. node for ROS behaviors.
+
         Returns:
         -------
-            The built behavior tree.
+            A tuple containing the built behavior tree and the setup report.
+
+        Raises:
+        ------
+            TreeSetupError: If the setup of any node failed or timed out.
 
         """
-        root = self._get_xml(self.file)
+        root = self.parse(target=target, optimize=optimize)
+        report = setup_tree(
+            root,
+            parallel=parallel,
+            timeout=timeout,
+            max_workers=max_workers,
+            raise_on_error=False,
+            **kwargs,
+        )
+
+        for node, duration in report.slowest(len(report.durations)):
+            self.logger.debug(f"Setup of {node.name} took {duration:.3f}s")
+        self.logger.debug(f"Setup of the tree took {report.total:.3f}s")
+
+        if not report.ok:
+            for node, ex in report.failed.items():
+                self.logger.error(f"Setup of {node.name} failed: {ex}")
+            for node in report.timed_out:
+                self.logger.error(f"Setup of {node.name} timed out after {timeout}s")
+            raise TreeSetupError(
+                f"Setup of {len(report.failed) + len(report.timed_out)} node(s) failed", report
+            )
 
-        return self._build_tree(root)
+        return root, report
@@ -0,0 +1,136 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module for registering short tag names for behaviors.
+
+Packages can map short tags, such as `Sequence`, to behaviors either by calling `register_tag`
+or by declaring an entry point in the `py_trees_parser.tags` group, e.g. in `setup.py`:
+
+    entry_points={
+        "py_trees_parser.tags": [
+            "FlashLedStrip = my_package.behaviors:FlashLedStrip",
+        ],
+    }
+
+Registered targets are only imported the first time their tag is looked up.
+"""
+
+from importlib.metadata import EntryPoint, entry_points
+from typing import Any
+
+ENTRY_POINT_GROUP = "py_trees_parser.tags"
+
+_registry: dict[str, Any] = {}
+_entry_points_loaded = False
+
+
+def _load_entry_points() -> None:
+    """Add the tags declared through entry points to the registry, once per process."""
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+
+    _entry_points_loaded = True
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        # explicit registrations take precedence over entry points
+        _registry.setdefault(entry_point.name, entry_point)
+
+
+def register_tag(tag: str, target: Any, replace: bool = False) -> None:
+    """
+    Register a short tag name for a behavior.
+
+    Args:
+    ----
+        tag (str): The tag name used in the XML.
+        target (Any): The behavior class or function, or its import path as a string in the
+            form "module:attr", in which case it is only imported on first use.
+        replace (bool, optional): Replace an existing registration of the tag.
+
+    Raises:
+    ------
+        KeyError: If the tag is already registered and replace is False.
+
+    """
+    _load_entry_points()
+    if tag in _registry and not replace:
+        raise KeyError(f"Tag {tag} is already registered")
+
+    if isinstance(target, str):
+        if ":" not in target:
+            module_name, obj_name = target.rsplit(".", 1)
+            target = f"{module_name}:{obj_name}"
+        target = EntryPoint(name=tag, value=target, group=ENTRY_POINT_GROUP)
+
+    _registry[tag] = target
+
+
+def unregister_tag(tag: str) -> None:
+    """
+    Remove a tag from the registry.
+
+    Args:
+    ----
+        tag (str): The tag name to remove.
+
+    """
+    _load_entry_points()
+    _registry.pop(tag, None)
+
+
+def lookup_tag(tag: str) -> Any | None:
+    """
+    Retrieve the behavior registered for a tag, importing it if necessary.
+
+    Args:
+    ----
+        tag (str): The tag name to look up.
+
+    Returns:
+    -------
+        The registered behavior, or None if the tag is not registered.
+
+    """
+    _load_entry_points()
+    target = _registry.get(tag)
+    if isinstance(target, EntryPoint):
+        target = target.load()
+        _registry[tag] = target
+
+    return target
+
+
+def qualified_name(tag: str) -> str | None:
+    """
+    Retrieve the fully qualified dotted path of a registered tag without importing it.
+
+    Args:
+    ----
+        tag (str): The tag name to look up.
+
+    Returns:
+    -------
+        The dotted path of the registered behavior, or None if the tag is not registered.
+
+    """
+    _load_entry_points()
+    target = _registry.get(tag)
+    if target is None:
+        return None
+
+    if isinstance(target, EntryPoint):
+        return target.value.replace(":", ".")
+
+    return f"{target.__module__}.{target.__qualname__}"
@@ -0,0 +1,214 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module for reporting the static cost of a behavior tree.
+
+The report is computed from the XML with all subtrees included, without constructing any
+behaviors. It can be used to keep track of the size of a tree, e.g. in code review:
+
+    ros2 run py_trees_parser py_trees_parser_report tree.xml --max-ticked 200
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from xml.etree.ElementTree import Element
+
+from py_trees_parser import registry
+from py_trees_parser.parser import BTParser, is_code
+
+ROS_PREFIXES = ("py_trees_ros.", "py_trees_parser.behaviors.testing_behaviors.")
+
+
+@dataclass
+class TreeReport:
+    """
+    The static cost of a behavior tree.
+
+    Attributes:
+    ----------
+        file (str): The XML file of the tree.
+        node_count (int): The total number of nodes.
+        node_types (dict[str, int]): The number of nodes per type.
+        max_depth (int): The depth of the deepest node, the root has depth 1.
+        parallel_fan_out (list[tuple[str, int]]): The path and number of children of every
+            parallel, the path joins the names of the nodes from the root with "/".
+        ros_nodes (int): The number of ROS-backed nodes.
+        expressions (list[str]): The distinct $() expressions in node attributes.
+        worst_case_ticked (int): An upper bound on the number of nodes visited by a single tick.
+            Every composite may tick all of its children in a single tick, including sequences
+            and selectors with memory that resume at their running child.
+
+    """
+
+    file: str
+    node_count: int = 0
+    node_types: dict = field(default_factory=dict)
+    max_depth: int = 0
+    parallel_fan_out: list = field(default_factory=list)
+    ros_nodes: int = 0
+    expressions: list = field(default_factory=list)
+    worst_case_ticked: int = 0
+
+    def summary(self) -> dict:
+        """
+        Summarize the report.
+
+        Returns:
+        -------
+            The report as a dictionary, with the number of distinct expressions instead of the
+            expressions themselves.
+
+        """
+        summary = asdict(self)
+        summary["expressions"] = len(self.expressions)
+
+        return summary
+
+
+def _qualified_name(tag: str) -> str:
+    """Retrieve the fully qualified name of a tag without importing it."""
+    return registry.qualified_name(tag) or tag
+
+
+def _walk(
+    xml_node: Element,
+    path: str,
+    depth: int,
+    report: TreeReport,
+    node_types: Counter,
+    expressions: set,
+    ros_prefixes: tuple,
+) -> int:
+    """
+    Add a node and its children to a report.
+
+    Returns:
+    -------
+        The worst case number of nodes visited when ticking the node.
+
+    """
+    node_type = _qualified_name(xml_node.tag)
+    node_types[node_type] += 1
+    report.node_count += 1
+    report.max_depth = max(report.max_depth, depth)
+    if node_type.startswith(ros_prefixes):
+        report.ros_nodes += 1
+    if node_type.endswith("Parallel"):
+        # names are not unique, e.g. when a subtree is included more than once
+        report.parallel_fan_out.append((path, len(xml_node)))
+
+    for value in xml_node.attrib.values():
+        if is_code(value.strip()):
+            expressions.add(value.strip())
+
+    # worst case every child is ticked: sequences that succeed, selectors that fail, parallels
+    return 1 + sum(
+        _walk(
+            child_xml,
+            f"{path}/{child_xml.attrib.get('name')}",
+            depth + 1,
+            report,
+            node_types,
+            expressions,
+            ros_prefixes,
+        )
+        for child_xml in xml_node
+    )
+
+
+def tree_report(
+    file: str, target: str | None = None, ros_prefixes: tuple = ROS_PREFIXES
+) -> TreeReport:
+    """
+    Compute the static cost of a behavior tree without constructing it.
+
+    Args:
+    ----
+        file (str): The XML file of the tree.
+        target (str, optional): Only report on the subtree rooted at this node, see
+            `BTParser.parse`.
+        ros_prefixes (tuple[str], optional): Nodes whose fully qualified type starts with any of
+            these prefixes are counted as ROS-backed.
+
+    Returns:
+    -------
+        The report.
+
+    """
+    root = BTParser(file).expand(target=target)
+    report = TreeReport(file=file)
+    node_types = Counter()
+    expressions = set()
+
+    report.worst_case_ticked = _walk(
+        root, root.attrib.get("name"), 1, report, node_types, expressions, tuple(ros_prefixes)
+    )
+    report.node_types = dict(node_types.most_common())
+    report.expressions = sorted(expressions)
+
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Print the report from the command line, failing if any of the given limits is exceeded."""
+    parser = argparse.ArgumentParser(description="Report the static cost of a behavior tree.")
+    parser.add_argument("file", help="the XML file of the tree")
+    parser.add_argument("--target", help="only report on the subtree rooted at this node")
+    parser.add_argument(
+        "--ros-prefix",
+        action="append",
+        help=f"prefix of ROS-backed node types, may be repeated (default: {ROS_PREFIXES})",
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as json")
+    parser.add_argument("--max-nodes", type=int, help="fail if there are more nodes")
+    parser.add_argument("--max-depth", type=int, help="fail if the tree is deeper")
+    parser.add_argument("--max-ticked", type=int, help="fail if a tick may visit more nodes")
+    args = parser.parse_args(argv)
+
+    report = tree_report(args.file, args.target, tuple(args.ros_prefix or ROS_PREFIXES))
+
+    if args.json:
+        print(json.dumps(report.summary(), indent=2))
+    else:
+        print(f"file: {report.file}")
+        print(f"nodes: {report.node_count}")
+        for node_type, count in report.node_types.items():
+            print(f"  {count:>5} {node_type}")
+        print(f"max depth: {report.max_depth}")
+        print("parallel fan-out:")
+        for path, fan_out in report.parallel_fan_out:
+            print(f"  {fan_out:>5} {path}")
+        print(f"ROS-backed nodes: {report.ros_nodes}")
+        print(f"distinct $() expressions: {len(report.expressions)}")
+        print(f"worst case nodes ticked: {report.worst_case_ticked}")
+
+    limits = (
+        ("nodes", report.node_count, args.max_nodes),
+        ("depth", report.max_depth, args.max_depth),
+        ("nodes ticked", report.worst_case_ticked, args.max_ticked),
+    )
+    exceeded = [
+        f"{name} {value} > {limit}" for name, value, limit in limits if limit and value > limit
+    ]
+    if exceeded:
+        print(f"Limits exceeded: {', '.join(exceeded)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module for sharing ROS publishers, subscriptions and service clients between behaviors.
+
+`BTParser.parse()` attaches a `ResourcePool` to the root of every tree it builds. Behaviors
+find it with `find_resource_pool` and acquire their ROS entities from it instead of creating
+them on the node, so that all behaviors using the same (node, topic, type, QoS) share a single
+entity. Entities are reference counted and destroyed once the last behavior releases them.
+"""
+
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import py_trees
+
+QOS_ATTRIBUTES = (
+    "history",
+    "depth",
+    "reliability",
+    "durability",
+    "deadline",
+    "lifespan",
+    "liveliness",
+    "liveliness_lease_duration",
+    "avoid_ros_namespace_conventions",
+)
+
+
+def qos_key(qos_profile: Any) -> Any:
+    """
+    Convert a QoS profile into a hashable key.
+
+    Args:
+    ----
+        qos_profile (QoSProfile | int | None): The QoS profile or history depth.
+
+    Returns:
+    -------
+        A key that is equal for equal profiles.
+
+    """
+    if qos_profile is None or isinstance(qos_profile, int):
+        return qos_profile
+
+    return tuple(str(getattr(qos_profile, attribute, None)) for attribute in QOS_ATTRIBUTES)
+
+
+@dataclass
+class _Entry:
+    """A shared entity and the number of behaviors using it."""
+
+    kind: str
+    key: tuple
+    node: Any
+    entity: Any
+    references: int = 0
+    callbacks: list = field(default_factory=list)
+
+    def dispatch(self, msg: Any) -> None:
+        """Pass a message to the callbacks of all behaviors sharing a subscription."""
+        for callback in list(self.callbacks):
+            callback(msg)
+
+
+class ResourcePool:
+    """
+    A pool of ROS entities shared by the behaviors of a tree, keyed by (node, name, type, QoS).
+
+    All methods are thread-safe, so behaviors may acquire entities from concurrent setups.
+
+    """
+
+    def __init__(self):
+        """Initialize the ResourcePool."""
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, _Entry] = {}
+        self._by_entity: dict[int, _Entry] = {}
+
+    def __len__(self) -> int:
+        """Retrieve the number of shared entities."""
+        return len(self._entries)
+
+    def _acquire(self, kind: str, node: Any, key: tuple, create: Callable) -> _Entry:
+        key = (kind, id(node), *key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(kind=kind, key=key, node=node, entity=None)
+                entry.entity = create(entry)
+                self._entries[key] = entry
+                self._by_entity[id(entry.entity)] = entry
+            entry.references += 1
+
+            return entry
+
+    def publisher(self, node: Any, msg_type: Any, topic: str, qos_profile: Any) -> Any:
+        """
+        Acquire a publisher shared with all behaviors publishing on the same topic.
+
+        Args:
+        ----
+            node (rclpy.node.Node): The node to create the publisher on.
+            msg_type (Any): The message type.
+            topic (str): The topic.
+            qos_profile (QoSProfile | int): The QoS profile or history depth.
+
+        Returns:
+        -------
+            The publisher.
+
+        """
+        return self._acquire(
+            "publisher",
+            node,
+            (topic, msg_type, qos_key(qos_profile)),
+            lambda entry: node.create_publisher(
+                msg_type=msg_type, topic=topic, qos_profile=qos_profile
+            ),
+        ).entity
+
+    def subscription(
+        self, node: Any, msg_type: Any, topic: str, callback: Callable, qos_profile: Any
+    ) -> Any:
+        """
+        Acquire a subscription shared with all behaviors subscribing to the same topic.
+
+        Every message is passed to the callbacks of all behaviors sharing the subscription.
+
+        Args:
+        ----
+            node (rclpy.node.Node): The node to create the subscription on.
+            msg_type (Any): The message type.
+            topic (str): The topic.
+            callback (Callable): The callback of the behavior.
+            qos_profile (QoSProfile | int): The QoS profile or history depth.
+
+        Returns:
+        -------
+            The subscription, release it together with the callback.
+
+        """
+        entry = self._acquire(
+            "subscription",
+            node,
+            (topic, msg_type, qos_key(qos_profile)),
+            lambda entry: node.create_subscription(
+                msg_type=msg_type, topic=topic, callback=entry.dispatch, qos_profile=qos_profile
+            ),
+        )
+        with self._lock:
+            entry.callbacks.append(callback)
+
+        return entry.entity
+
+    def client(self, node: Any, srv_type: Any, srv_name: str, qos_profile: Any = None) -> Any:
+        """
+        Acquire a service client shared with all behaviors calling the same service.
+
+        Args:
+        ----
+            node (rclpy.node.Node): The node to create the client on.
+            srv_type (Any): The service type.
+            srv_name (str): The name of the service.
+            qos_profile (QoSProfile, optional): The QoS profile, defaults to that of the node.
+
+        Returns:
+        -------
+            The client.
+
+        """
+        kwargs = {} if qos_profile is None else {"qos_profile": qos_profile}
+        return self._acquire(
+            "client",
+            node,
+            (srv_name, srv_type, qos_key(qos_profile)),
+            lambda entry: node.create_client(srv_type, srv_name, **kwargs),
+        ).entity
+
+    def references(self, entity: Any) -> int:
+        """
+        Retrieve the number of behaviors using an entity.
+
+        Args:
+        ----
+            entity (Any): The publisher, subscription or client.
+
+        Returns:
+        -------
+            The number of references, 0 if the entity is not in the pool.
+
+        """
+        with self._lock:
+            entry = self._by_entity.get(id(entity))
+            return 0 if entry is None else entry.references
+
+    def release(self, entity: Any, callback: Callable | None = None) -> None:
+        """
+        Release an entity, destroying it once no behavior uses it anymore.
+
+        Args:
+        ----
+            entity (Any): The publisher, subscription or client.
+            callback (Callable, optional): The callback the subscription was acquired with.
+
+        Raises:
+        ------
+            KeyError: If the entity is not in the pool.
+
+        """
+        with self._lock:
+            entry = self._by_entity.get(id(entity))
+            if entry is None:
+                raise KeyError(f"{entity} is not in the resource pool")
+
+            if callback is not None:
+                entry.callbacks.remove(callback)
+            entry.references -= 1
+            if entry.references > 0:
+                return
+
+            del self._entries[entry.key]
+            del self._by_entity[id(entity)]
+
+        getattr(entry.node, f"destroy_{entry.kind}")(entity)
+
+
+def find_resource_pool(behaviour: py_trees.behaviour.Behaviour) -> ResourcePool | None:
+    """
+    Find the resource pool of the tree a behavior is part of.
+
+    The pool is attached to the root of every tree built by the parser. When that tree has been
+    added to a larger tree, the pool of the nearest such root is used.
+
+    Args:
+    ----
+        behaviour (Behaviour): The behavior.
+
+    Returns:
+    -------
+        The resource pool, or None if the behavior is not part of a tree built by the parser.
+
+    """
+    node = behaviour
+    while node is not None:
+        pool = getattr(node, "resource_pool", None)
+        if pool is not None:
+            return pool
+        node = node.parent
+
+    return None
@@ -0,0 +1,226 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module for transpiling a behavior tree XML file into a Python module.
+
+The generated module has a `build()` function that calls the constructors of all behaviors
+directly, with the $() expressions of the XML inlined as Python code. Importing it skips parsing
+and evaluating the XML entirely and benefits from bytecode caching, while the XML stays the
+source of truth:
+
+    ros2 run py_trees_parser py_trees_parser_transpile tree.xml -o tree.py
+"""
+
+import argparse
+import ast
+import importlib
+import math
+import os
+from xml.etree.ElementTree import Element
+
+from py_trees_parser.parser import (
+    BTParseError,
+    BTParser,
+    extract_modules,
+    get_strategy,
+    is_array,
+    is_code,
+    is_deferred,
+    is_float,
+)
+
+HEADER = '''"""
+Behavior tree transpiled from {source} by py_trees_parser, do not edit.
+
+DIGEST is the digest of the include graph of the XML, the module is out of date when
+`BTParser(SOURCE).include_graph().digest` differs.
+"""
+'''
+
+
+class _Transpiler:
+    """Generate the statements of a build() function from an expanded XML tree."""
+
+    def __init__(self, parser: BTParser):
+        self.parser = parser
+        self.imports = set()
+        self.arrays = {}
+        self.lines = []
+        self.nodes = 0
+        self.deferred = False
+
+    def _import(self, code: str) -> None:
+        """Import the modules an expression refers to, like `BTParser._parse_code` does."""
+        for module in extract_modules(ast.parse(code, mode="eval")):
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                continue
+            self.imports.add(module)
+
+    def _literal(self, value: str) -> str:
+        """Convert an attribute to the Python code of its value, see `_string_num_or_code`."""
+        value = value.strip()
+        if value.isnumeric():
+            return repr(int(value))
+        if is_float(value):
+            number = float(value)
+            return repr(number) if math.isfinite(number) else f"float({value!r})"
+        if is_code(value):
+            code = value[2:-1]
+            self._import(code)
+            return f"({code.strip()})"
+        if is_array(value):
+            path = value[len("$array(") : -1].strip()
+            if path not in self.arrays:
+                self.arrays[path] = f"array_{len(self.arrays)}"
+            return self.arrays[path]
+        if is_deferred(value):
+            code = value[len("$defer(") : -1]
+            self._import(code)
+            self.deferred = True
+            return f"Deferred(None, {code!r}, lambda: ({code.strip()}))"
+
+        return repr(value)
+
+    def node(self, xml_node: Element) -> str:
+        """
+        Add the statements constructing a node and its children.
+
+        Returns:
+        -------
+            The variable holding the node.
+
+        """
+        children = [self.node(child_xml) for child_xml in xml_node]
+
+        _, obj = self.parser._get_handle(xml_node.tag)
+        try:
+            strategy = get_strategy(obj)
+        except KeyError as ex:
+            raise KeyError(
+                f"{xml_node.tag} was not an expected type (Behavior, Composite, Decorator, Idiom)"
+            ) from ex
+        if "<locals>" in obj.__qualname__:
+            raise BTParseError(f"{xml_node.tag} cannot be imported from {obj.__module__}")
+        self.imports.add(obj.__module__)
+
+        attribs = dict(xml_node.attrib)
+        name = attribs.pop("name")
+        strategy.check_attributes(xml_node.tag, attribs)
+
+        arguments = [f"name={name!r}"]
+        for key, value in strategy.children_kwargs(name, children).items():
+            value = f"[{', '.join(value)}]" if isinstance(value, list) else value
+            arguments.append(f"{key}={value}")
+        arguments.extend(f"{key}={self._literal(value)}" for key, value in attribs.items())
+
+        variable = f"node_{self.nodes}"
+        self.nodes += 1
+        self.lines.append(
+            f"{variable} = {obj.__module__}.{obj.__qualname__}({', '.join(arguments)})"
+        )
+        if any(is_deferred(value.strip()) for value in attribs.values()):
+            self.lines.append(f"bind_deferred({variable})")
+
+        return variable
+
+
+def transpile(file: str, target: str | None = None, optimize: bool = False) -> str:
+    """
+    Transpile a behavior tree XML file into the source code of a Python module.
+
+    Only the include attributes and arguments of subtrees are evaluated, all other $()
+    expressions are inlined. $array() files are loaded when `build()` is called.
+
+    Args:
+    ----
+        file (str): The XML file of the tree.
+        target (str, optional): Only transpile the subtree rooted at this node, see
+            `BTParser.parse`.
+        optimize (bool, optional): Rewrite the tree into a cheaper but equivalent tree first,
+            see `py_trees_parser.optimizer`.
+
+    Returns:
+    -------
+        The source code of the module.
+
+    Raises:
+    ------
+        BTParseError: If the target could not be found or a node cannot be constructed.
+
+    """
+    parser = BTParser(file)
+    root = parser.expand(target=target)
+    if optimize:
+        from py_trees_parser.optimizer import optimize as optimize_tree
+
+        root, _ = optimize_tree(root)
+
+    transpiler = _Transpiler(parser)
+    variable = transpiler.node(root)
+
+    arrays = [
+        f"{array} = numpy.load({path!r}, mmap_mode='r', allow_pickle=False)"
+        for path, array in transpiler.arrays.items()
+    ]
+    if arrays:
+        transpiler.imports.add("numpy")
+
+    source = [HEADER.format(source=os.path.basename(file))]
+    source.extend(f"import {module}" for module in sorted(transpiler.imports))
+    source.append("")
+    if transpiler.deferred:
+        source.append("from py_trees_parser.parser import Deferred, bind_deferred")
+    source.append("from py_trees_parser.resources import ResourcePool")
+    source.extend(
+        [
+            "",
+            f"SOURCE = {os.path.realpath(file)!r}",
+            f"DIGEST = {parser.include_graph().digest!r}",
+            "",
+            "",
+            "def build():",
+            '    """Build the behavior tree."""',
+        ]
+    )
+    source.extend(f"    {line}" for line in arrays + transpiler.lines)
+    source.extend([f"    {variable}.resource_pool = ResourcePool()", f"    return {variable}", ""])
+
+    return "\n".join(source)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Transpile a tree from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Transpile a behavior tree XML file into a Python module."
+    )
+    parser.add_argument("file", help="the XML file of the tree")
+    parser.add_argument("-o", "--output", help="the module to write (default: print it)")
+    parser.add_argument("--target", help="only transpile the subtree rooted at this node")
+    parser.add_argument("--optimize", action="store_true", help="optimize the tree first")
+    args = parser.parse_args(argv)
+
+    source = transpile(args.file, target=args.target, optimize=args.optimize)
+
+    if args.output is None:
+        print(source, end="")
+    else:
+        with open(args.output, "w") as f:
+            f.write(source)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Module for setting up the behaviors of a tree concurrently.
+
+The `setup()` of a behavior only depends on the keyword arguments it is given, so the setups of
+all nodes in a tree can run at the same time. This pays off for trees with many behaviors that
+wait for ROS servers during setup.
+"""
+
+import concurrent.futures
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+
+import py_trees
+
+# interval at which running setups are checked for timeouts
+_POLL_INTERVAL = 0.05
+
+
+class TreeSetupError(RuntimeError):
+    """
+    Exception raised when the setup of one or more nodes failed or timed out.
+
+    Attributes:
+    ----------
+        report (SetupReport): The report of the failed setup.
+
+    """
+
+    def __init__(self, message: str, report: "SetupReport"):
+        """Initialize the TreeSetupError."""
+        super().__init__(message)
+        self.report = report
+
+
+@dataclass
+class SetupReport:
+    """
+    The outcome of setting up a tree.
+
+    Attributes:
+    ----------
+        durations (dict[Behaviour, float]): The setup time in seconds of every node whose setup
+            finished, including failed setups.
+        timed_out (list[Behaviour]): The nodes whose setup did not finish within the timeout.
+        failed (dict[Behaviour, Exception]): The exception raised by every failed setup.
+        total (float): The wall time in seconds of the whole setup.
+
+    """
+
+    durations: dict = field(default_factory=dict)
+    timed_out: list = field(default_factory=list)
+    failed: dict = field(default_factory=dict)
+    total: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether every node was set up successfully."""
+        return not self.timed_out and not self.failed
+
+    def slowest(self, count: int = 5) -> list[tuple[py_trees.behaviour.Behaviour, float]]:
+        """
+        Retrieve the nodes with the longest setup times.
+
+        Args:
+        ----
+            count (int, optional): The number of nodes to retrieve.
+
+        Returns:
+        -------
+            A list of (node, duration) tuples, slowest first.
+
+        """
+        return sorted(self.durations.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def _timed_setup(node: py_trees.behaviour.Behaviour, started: dict, kwargs: dict) -> float:
+    started[node] = time.monotonic()
+    node.setup(**kwargs)
+    return time.monotonic() - started[node]
+
+
+def _setup_worker(work: queue.SimpleQueue, started: dict, kwargs: dict) -> None:
+    """Run the queued setups until the queue is empty."""
+    while True:
+        try:
+            future, node = work.get_nowait()
+        except queue.Empty:
+            return
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            future.set_result(_timed_setup(node, started, kwargs))
+        except Exception as ex:
+            future.set_exception(ex)
+
+
+def setup_tree(
+    root: py_trees.behaviour.Behaviour,
+    parallel: bool = True,
+    timeout: float | None = None,
+    max_workers: int | None = None,
+    raise_on_error: bool = True,
+    **kwargs,
+) -> SetupReport:
+    """
+    Call `setup()` on every node of a tree, optionally on a pool of threads.
+
+    Args:
+    ----
+        root (Behaviour): The root of the tree.
+        parallel (bool, optional): Run the setups on a thread pool instead of one after another.
+        timeout (float, optional): The time in seconds a single node's setup may take, None to
+            wait indefinitely. Setups cannot be interrupted: a parallel setup that times out
+            keeps running on a daemon thread, which does not keep the process from exiting, and
+            a sequential setup is only reported as timed out after it returns. Its thread is
+            replaced, so the remaining setups keep the same number of threads.
+        max_workers (int, optional): The number of threads, defaults to the same number as a
+            `ThreadPoolExecutor`.
+        raise_on_error (bool, optional): Raise if any setup failed or timed out.
+        **kwargs: Keyword arguments passed to every node's setup, e.g. node for ROS behaviors.
+
+    Returns:
+    -------
+        The setup report.
+
+    Raises:
+    ------
+        TreeSetupError: If raise_on_error is set and any setup failed or timed out.
+
+    """
+    nodes = list(root.iterate())
+    report = SetupReport()
+    started = {}
+    start = time.monotonic()
+
+    if not parallel:
+        for node in nodes:
+            try:
+                duration = _timed_setup(node, started, kwargs)
+            except Exception as ex:
+                duration = time.monotonic() - started[node]
+                report.failed[node] = ex
+            report.durations[node] = duration
+            if timeout is not None and duration > timeout:
+                report.timed_out.append(node)
+    else:
+        work = queue.SimpleQueue()
+        pending = {}
+        for node in nodes:
+            future = concurrent.futures.Future()
+            work.put((future, node))
+            pending[future] = node
+
+        workers = 0
+
+        def start_worker() -> None:
+            # unlike the workers of a ThreadPoolExecutor, daemon threads are not joined at exit,
+            # so a setup that never returns does not hang the process
+            nonlocal workers
+            threading.Thread(
+                target=_setup_worker,
+                args=(work, started, kwargs),
+                name=f"bt_setup_{workers}",
+                daemon=True,
+            ).start()
+            workers += 1
+
+        max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        for _ in range(min(max_workers, len(nodes))):
+            start_worker()
+
+        try:
+            while pending:
+                done, _ = concurrent.futures.wait(
+                    pending, timeout=_POLL_INTERVAL, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    node = pending.pop(future)
+                    try:
+                        report.durations[node] = future.result()
+                    except Exception as ex:
+                        report.durations[node] = time.monotonic() - started[node]
+                        report.failed[node] = ex
+
+                if timeout is None:
+                    continue
+
+                now = time.monotonic()
+                for future, node in list(pending.items()):
+                    if node in started and now - started[node] > timeout:
+                        report.timed_out.append(node)
+                        del pending[future]
+                        # the thread is stuck in the setup, replace it for the queued setups
+                        if not work.empty():
+                            start_worker()
+        finally:
+            # timed out setups cannot be interrupted, only those that have not started
+            for future in pending:
+                future.cancel()
+
+    report.total = time.monotonic() - start
+
+    if raise_on_error and not report.ok:
+        failures = [f"{node.name}: {ex}" for node, ex in report.failed.items()]
+        failures += [f"{node.name}: timed out after {timeout}s" for node in report.timed_out]
+        raise TreeSetupError(f"Tree setup failed [{', '.join(failures)}]", report)
+
+    return report
@@ -37,5 +37,44 @@ setup(
     description="A py_trees xml parser",
     license="Apache-2.0",
     tests_require=["pytest"],
-    entry_points={},
+    entry_points={
+        "console_scripts": [
+            "py_trees_parser_benchmark = py_trees_parser.benchmark:main",
+            "py_trees_parser_bundle = py_trees_parser.bundle:main",
+            "py_trees_parser_report = py_trees_parser.report:main",
+            "py_trees_parser_transpile = py_trees_parser.transpiler:main",
+        ],
+        "py_trees_parser.tags": [
+            "Parallel = py_trees.composites:Parallel",
+            "Selector = py_trees.composites:Selector",
+            "Sequence = py_trees.composites:Sequence",
+            "Condition = py_trees.decorators:Condition",
+            "Count = py_trees.decorators:Count",
+            "EternalGuard = py_trees.decorators:EternalGuard",
+            "FailureIsRunning = py_trees.decorators:FailureIsRunning",
+            "FailureIsSuccess = py_trees.decorators:FailureIsSuccess",
+            "Inverter = py_trees.decorators:Inverter",
+            "OneShot = py_trees.decorators:OneShot",
+            "PassThrough = py_trees.decorators:PassThrough",
+            "Repeat = py_trees.decorators:Repeat",
+            "Retry = py_trees.decorators:Retry",
+            "RunningIsFailure = py_trees.decorators:RunningIsFailure",
+            "RunningIsSuccess = py_trees.decorators:RunningIsSuccess",
+            "StatusToBlackboard = py_trees.decorators:StatusToBlackboard",
+            "SuccessIsFailure = py_trees.decorators:SuccessIsFailure",
+            "SuccessIsRunning = py_trees.decorators:SuccessIsRunning",
+            "Timeout = py_trees.decorators:Timeout",
+            "CheckBlackboardVariableValue = py_trees.behaviours:CheckBlackboardVariableValue",
+            "Dummy = py_trees.behaviours:Dummy",
+            "Failure = py_trees.behaviours:Failure",
+            "Periodic = py_trees.behaviours:Periodic",
+            "Running = py_trees.behaviours:Running",
+            "Success = py_trees.behaviours:Success",
+            "Timer = py_trees.timers:Timer",
+            "FusedBlackboardCheck = py_trees_parser.behaviors.conditions:FusedBlackboardCheck",
+            "ThreadedParallel = py_trees_parser.behaviors.composites:ThreadedParallel",
+            "FlashLedStrip = py_trees_parser.behaviors.testing_behaviors:FlashLedStrip",
+            "ScanContext = py_trees_parser.behaviors.testing_behaviors:ScanContext",
+        ],
+    },
 )
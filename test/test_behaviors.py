@@ -0,0 +1,151 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the behaviors provided by this package."""
+
+import os
+import threading
+import time
+
+import py_trees
+import pytest
+from ament_index_python.packages import get_package_share_directory
+from py_trees.common import ParallelPolicy, Status
+
+from py_trees_parser.behaviors import ThreadedParallel
+from py_trees_parser.parser import BTParser
+
+SHARE_DIR = get_package_share_directory("py_trees_parser")
+
+
+class Blocking(py_trees.behaviour.Behaviour):
+    """A behavior whose update blocks until it is released."""
+
+    def __init__(self, name: str, status: Status = Status.SUCCESS):
+        """Initialize the behavior with the status to return once released."""
+        super().__init__(name=name)
+        self.result = status
+        self.released = threading.Event()
+
+    def update(self) -> Status:
+        """Block until released."""
+        self.released.wait()
+        return self.result
+
+
+def test_threaded_parallel_parse():
+    """Test that a threaded parallel is built from XML and follows the parallel policy."""
+    root = BTParser(os.path.join(SHARE_DIR, "test/data/test_threaded_parallel.xml")).parse()
+
+    assert isinstance(root, ThreadedParallel)
+    assert root.max_workers == 2
+    assert root.deadline == 0.5
+
+    reference = py_trees.composites.Parallel(
+        "Reference",
+        root.policy,
+        [py_trees.behaviours.Success("Success"), py_trees.behaviours.Periodic("Periodic", n=2)],
+    )
+    for _ in range(6):
+        root.tick_once()
+        reference.tick_once()
+        assert root.status == reference.status
+    root.shutdown()
+
+
+def test_threaded_parallel_concurrent():
+    """Test that children are ticked at the same time."""
+    children = [Blocking(f"Blocking {index}") for index in range(3)]
+    barrier = threading.Barrier(len(children), action=lambda: [c.released.set() for c in children])
+    for child in children:
+        child.initialise = lambda: barrier.wait(timeout=1)
+    root = ThreadedParallel("Threaded", ParallelPolicy.SuccessOnAll(), children)
+
+    root.tick_once()
+
+    assert root.status == Status.SUCCESS
+    root.shutdown()
+
+
+def test_threaded_parallel_deadline():
+    """Test that a child that misses the deadline counts as running until its tick completes."""
+    slow = Blocking("Slow", Status.FAILURE)
+    root = ThreadedParallel(
+        "Threaded", ParallelPolicy.SuccessOnAll(), [slow, py_trees.behaviours.Success("Fast")]
+    )
+    root.deadline = 0.05
+
+    start = time.monotonic()
+    root.tick_once()
+    assert time.monotonic() - start < 1
+    assert root.status == Status.RUNNING
+
+    root.tick_once()
+    assert root.status == Status.RUNNING
+
+    slow.released.set()
+    root._pending[slow].result(timeout=1)
+    root.tick_once()
+    assert root.status == Status.FAILURE
+    assert root.current_child is slow
+    root.shutdown()
+
+
+@pytest.mark.parametrize(
+    "policy, sibling, status",
+    [
+        (ParallelPolicy.SuccessOnOne(), py_trees.behaviours.Success("Fast"), Status.SUCCESS),
+        (ParallelPolicy.SuccessOnAll(), py_trees.behaviours.Failure("Fast"), Status.FAILURE),
+    ],
+)
+def test_threaded_parallel_stop_pending(policy, sibling, status):
+    """Test that finishing with a pending child does not wait for it and stops it afterwards."""
+    slow = Blocking("Slow", Status.RUNNING)
+    root = ThreadedParallel("Threaded", policy, [slow, sibling], deadline=0.05)
+
+    start = time.monotonic()
+    root.tick_once()
+    assert time.monotonic() - start < 1
+    assert root.status == status
+    assert root.current_child is sibling
+
+    root.tick_once()
+    assert root.status == status
+    assert slow in root._stopping
+
+    slow.released.set()
+    start = time.monotonic()
+    while root._stopping and time.monotonic() - start < 1:
+        time.sleep(0.01)
+    assert slow.status == Status.INVALID
+    assert not root._stopping
+    root.shutdown()
+
+
+def test_threaded_parallel_shutdown_hung():
+    """Test that shutting down does not wait for a hung child, which is left on a daemon thread."""
+    hung = Blocking("Hung")
+    root = ThreadedParallel(
+        "Threaded", ParallelPolicy.SuccessOnAll(), [hung, py_trees.behaviours.Success("Fast")]
+    )
+    root.deadline = 0.05
+    root.tick_once()
+
+    start = time.monotonic()
+    root.stop(Status.INVALID)
+    root.shutdown()
+    assert time.monotonic() - start < 1
+
+    threads = [thread for thread in threading.enumerate() if thread.name.startswith("Threaded")]
+    assert threads and all(thread.daemon for thread in threads)
+    hung.released.set()
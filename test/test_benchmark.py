@@ -0,0 +1,66 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the tick benchmark harness."""
+
+import os
+
+import pytest
+import rclpy
+from ament_index_python.packages import get_package_share_directory
+
+from py_trees_parser.benchmark import FakeNode, run_benchmark
+
+SHARE_DIR = get_package_share_directory("py_trees_parser")
+
+
+@pytest.fixture(scope="module")
+def ros_init():
+    """Initialize ros."""
+    rclpy.init()
+    yield
+    rclpy.shutdown()
+
+
+@pytest.mark.parametrize(
+    "tree_file",
+    [
+        "test/data/test_args.xml",
+        "test/data/test6.xml",
+    ],
+)
+def test_benchmark(ros_init, tree_file):
+    """Test that the benchmark ticks the tree and reports latencies and allocations."""
+    node = FakeNode()
+    result = run_benchmark(os.path.join(SHARE_DIR, tree_file), ticks=20, warmup=2, node=node)
+
+    assert len(result.latencies) == 20
+    assert len(result.peak_bytes) == 20
+    summary = result.summary()
+    assert summary["p50_us"] <= summary["p99_us"] <= summary["p100_us"]
+
+
+def test_benchmark_target(ros_init):
+    """Test that the benchmark ticks a subtree whose behaviors call parameter services."""
+    result = run_benchmark(
+        os.path.join(SHARE_DIR, "test/data/test6.xml"), ticks=20, warmup=2, target="Scanning"
+    )
+
+    assert result.nodes == 4
+    assert len(result.latencies) == 20
+
+
+def test_benchmark_no_ticks():
+    """Test that a benchmark without measured ticks is rejected."""
+    with pytest.raises(ValueError):
+        run_benchmark(os.path.join(SHARE_DIR, "test/data/test_args.xml"), ticks=0)
@@ -0,0 +1,127 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for packing and parsing single-file tree bundles."""
+
+import os
+import shutil
+import zipfile
+
+import pytest
+from ament_index_python.packages import get_package_share_directory
+
+from py_trees_parser.bundle import MANIFEST, BundleError, pack
+from py_trees_parser.parser import BTParser
+
+SHARE_DIR = get_package_share_directory("py_trees_parser")
+
+
+def test_pack(tmp_path):
+    """Test that a bundle contains the root file and everything it includes."""
+    bundle = pack(
+        os.path.join(SHARE_DIR, "test/data/test_package_include.xml"), tmp_path / "tree.btz"
+    )
+
+    assert bundle.root == "test_package_include.xml"
+    assert sorted(bundle.files) == [
+        "test_package_include.xml",
+        "test_subtree_args.xml",
+        "test_subtree_sub.xml",
+    ]
+    assert bundle.includes == {
+        "package://py_trees_parser/test/data/test_subtree_args.xml": "test_subtree_args.xml",
+        "$(find py_trees_parser)/test/data/test_subtree_sub.xml": "test_subtree_sub.xml",
+    }
+
+    parser = BTParser(str(tmp_path / "tree.btz"))
+    parser.parse()
+    assert parser.bundle.digest == bundle.digest
+
+
+def test_parse_bundle(tmp_path):
+    """Test that a bundle is parsed without reading the packed files from the filesystem."""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    shutil.copy(os.path.join(SHARE_DIR, "test/data/test_subtree_args.xml"), data_dir)
+    (data_dir / "tree.xml").write_text(
+        f'''<subtree name="bundled" include="{data_dir / "test_subtree_args.xml"}">
+          <arg name="selector_name" value="Bundled Selector" />
+          <arg name="idle_name" value="Idle" />
+          <arg name="flip_name" value="Flip Eggs" />
+          <arg name="n" value="2" />
+        </subtree>'''
+    )
+    pack(str(data_dir / "tree.xml"), tmp_path / "tree.btz")
+    shutil.rmtree(data_dir)
+
+    parser = BTParser(str(tmp_path / "tree.btz"))
+    root = parser.parse()
+
+    assert root.name == "Bundled Selector"
+    assert [child.name for child in root.children] == ["Idle", "Flip Eggs"]
+    assert parser.include_graph().dependencies() == {
+        os.path.join(parser.bundle.path, "test_subtree_args.xml")
+    }
+
+
+def test_pack_conditional(tmp_path):
+    """Test that the includes of skipped branches are neither read nor packed by default."""
+    bundle = pack(os.path.join(SHARE_DIR, "test/data/test_conditional.xml"), tmp_path / "tree.btz")
+
+    assert sorted(bundle.files) == ["test_conditional.xml", "test_conditional_sub.xml"]
+    root = BTParser(str(tmp_path / "tree.btz")).parse()
+    assert [child.name for child in root.children] == ["Variant", "Unless"]
+
+
+def test_pack_all_branches(tmp_path, monkeypatch):
+    """Test that a bundle packed with all branches serves every variant."""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for variant in ("a", "b"):
+        (data_dir / f"variant_{variant}.xml").write_text(
+            f'<py_trees.behaviours.Success name="Variant {variant.upper()}" />'
+        )
+    (data_dir / "tree.xml").write_text(
+        f"""<py_trees.composites.Sequence name="Mission" memory="$(False)">
+          <subtree name="a" include="{data_dir / "variant_a.xml"}"
+            if="$(os.environ['ROBOT_VARIANT'] == 'a')" />
+          <subtree name="b" include="{data_dir / "variant_b.xml"}"
+            if="$(os.environ['ROBOT_VARIANT'] == 'b')" />
+        </py_trees.composites.Sequence>"""
+    )
+    monkeypatch.setenv("ROBOT_VARIANT", "a")
+    bundle = pack(str(data_dir / "tree.xml"), tmp_path / "tree.btz", all_branches=True)
+    shutil.rmtree(data_dir)
+
+    monkeypatch.setenv("ROBOT_VARIANT", "b")
+    root = BTParser(str(tmp_path / "tree.btz")).parse()
+
+    assert sorted(bundle.files) == ["tree.xml", "variant_a.xml", "variant_b.xml"]
+    assert [child.name for child in root.children] == ["Variant B"]
+
+
+def test_corrupt_bundle(tmp_path):
+    """Test that a bundle whose contents do not match its digest is rejected."""
+    tree_file = os.path.join(SHARE_DIR, "test/data/test_cascade_args.xml")
+    pack(tree_file, tmp_path / "tree.btz")
+
+    with zipfile.ZipFile(tmp_path / "tree.btz") as archive:
+        members = {member: archive.read(member) for member in archive.namelist()}
+    members["test_subtree_args.xml"] = members["test_subtree_args.xml"].replace(b"False", b"True")
+    with zipfile.ZipFile(tmp_path / "tree.btz", "w") as archive:
+        for member, data in members.items():
+            archive.writestr(member, data)
+
+    assert MANIFEST in members
+    with pytest.raises(BundleError):
+        BTParser(str(tmp_path / "tree.btz")).parse()
@@ -20,6 +20,7 @@ instances are valid.
 """
 
 import os
+import threading
 
 import py_trees
 import py_trees_ros
@@ -27,7 +28,10 @@ import pytest
 import rclpy
 from ament_index_python.packages import get_package_share_directory
 
-from py_trees_parser.parser import BTParser
+from py_trees_parser import register_tag, registry, unregister_tag
+from py_trees_parser.behaviors import FusedBlackboardCheck
+from py_trees_parser.parser import BTParseError, BTParser, Deferred, IncludeCycleError
+from py_trees_parser.tree_setup import setup_tree
 
 SHARE_DIR = get_package_share_directory("py_trees_parser")
 
@@ -107,3 +111,319 @@ def test_subtree_cascaded_args(setup_parser):
             assert child.period == 2
         else:
             assert False, f"Unexpected child node type {type(child)}"  # noqa
+
+
+def test_include_graph(ros_init):
+    """Test that the include graph follows cascaded subtrees without building the tree."""
+    data_dir = os.path.realpath(os.path.join(SHARE_DIR, "test/data"))
+    parser = BTParser(os.path.join(data_dir, "test_cascade_args.xml"))
+    graph = parser.include_graph()
+
+    cascade = os.path.join(data_dir, "test_subtree_cascade.xml")
+    sub = os.path.join(data_dir, "test_subtree_args.xml")
+    assert graph.root == os.path.join(data_dir, "test_cascade_args.xml")
+    assert set(graph.files) == {graph.root, cascade, sub}
+    assert graph.includes(graph.root) == [cascade]
+    assert graph.dependencies() == {cascade, sub}
+    assert len(graph.edges) == 2
+    assert graph.edges[1].args["n"] == "2"
+    assert len(graph.digest) == 64
+
+
+def test_include_cycle(ros_init):
+    """Test that include cycles are reported instead of recursing forever."""
+    parser = BTParser(os.path.join(SHARE_DIR, "test/data/test_cycle_a.xml"))
+    with pytest.raises(IncludeCycleError):
+        parser.include_graph()
+    with pytest.raises(IncludeCycleError):
+        parser.parse()
+
+
+def test_registered_tags(setup_parser, monkeypatch):
+    """Test that registered short tags resolve to their behaviors."""
+    # restore the tags of the entry points afterwards
+    registry._load_entry_points()
+    monkeypatch.setattr(registry, "_registry", dict(registry._registry))
+
+    register_tag("Selector", "py_trees.composites:Selector", replace=True)
+    register_tag("Running", py_trees.behaviours.Running, replace=True)
+    root = setup_parser("test/data/test_registry.xml")
+
+    assert isinstance(root, py_trees.composites.Selector)
+    assert isinstance(root.children[0], py_trees.behaviours.Running)
+    assert isinstance(root.children[1], py_trees.behaviours.Periodic)
+
+    unregister_tag("Running")
+    assert registry.lookup_tag("Running") is None
+
+
+def test_entry_point_tags(setup_parser):
+    """Test that the tags declared through entry points resolve without registering them."""
+    assert registry.qualified_name("Selector") == "py_trees.composites.Selector"
+
+    root = setup_parser("test/data/test_registry.xml")
+
+    assert isinstance(root, py_trees.composites.Selector)
+    assert isinstance(root.children[0], py_trees.behaviours.Running)
+
+
+def test_unknown_attribute(ros_init):
+    """Test that attributes the behavior does not accept are rejected before construction."""
+    parser = BTParser(os.path.join(SHARE_DIR, "test/data/test_unknown_attribute.xml"))
+    with pytest.raises(BTParseError, match="colour"):
+        parser.parse()
+
+
+def test_parse_and_setup(ros_init):
+    """Test that all nodes are set up and reported."""
+    parser = BTParser(os.path.join(SHARE_DIR, "test/data/test_args.xml"))
+    root, report = parser.parse_and_setup(parallel=True, timeout=5.0)
+
+    assert report.ok
+    assert set(report.durations) == set(root.iterate())
+
+
+def test_setup_timeout():
+    """Test that a hung setup is reported as timed out and left on a daemon thread."""
+    released = threading.Event()
+    hung = py_trees.behaviours.Running("Hung")
+    hung.setup = lambda **kwargs: released.wait()
+    root = py_trees.composites.Sequence(
+        "Root", memory=False, children=[hung, py_trees.behaviours.Success("Fast")]
+    )
+
+    report = setup_tree(root, timeout=0.05, raise_on_error=False)
+
+    assert report.timed_out == [hung]
+    assert set(report.durations) == {root, root.children[1]}
+    threads = [thread for thread in threading.enumerate() if thread.name.startswith("bt_setup")]
+    assert threads and all(thread.daemon for thread in threads)
+    released.set()
+
+
+def test_setup_timeout_bounded():
+    """Test that hung setups do not starve the queued setups of a bounded number of threads."""
+    released = threading.Event()
+    hung = [py_trees.behaviours.Running(f"Hung {index}") for index in range(3)]
+    for node in hung:
+        node.setup = lambda **kwargs: released.wait()
+    root = py_trees.composites.Sequence(
+        "Root", memory=False, children=[*hung, py_trees.behaviours.Success("Fast")]
+    )
+
+    try:
+        report = setup_tree(root, timeout=0.05, max_workers=1, raise_on_error=False)
+    finally:
+        released.set()
+
+    assert report.timed_out == hung
+    assert set(report.durations) == {root, root.children[-1]}
+
+
+def test_package_include(setup_parser):
+    """Test that package:// and $(find pkg) includes resolve to the package share directory."""
+    root = setup_parser("test/data/test_package_include.xml")
+
+    assert [child.name for child in root.children] == ["Package Selector", "SubTreeSub"]
+
+
+@pytest.mark.parametrize(
+    "target",
+    [
+        "Subtree Selector",
+        ".//py_trees.composites.Selector[@name='Subtree Selector']",
+        "/py_trees.composites.Selector",
+    ],
+)
+def test_parse_target(ros_init, target):
+    """Test that only the targeted subtree is built, following includes as needed."""
+    parser = BTParser(os.path.join(SHARE_DIR, "test/data/test_cascade_args.xml"))
+    root = parser.parse(target=target)
+
+    assert isinstance(root, py_trees.composites.Selector)
+    assert root.name == "Subtree Selector"
+    assert [child.name for child in root.children] == ["Idle", "Flip Eggs"]
+    assert root.children[1].period == 2
+
+
+def test_parse_target_not_found(ros_init):
+    """Test that a missing target is reported."""
+    parser = BTParser(os.path.join(SHARE_DIR, "test/data/test_args.xml"))
+    with pytest.raises(BTParseError):
+        parser.parse(target="Missing")
+
+
+def test_array_attribute(ros_init, tmp_path):
+    """Test that $array() attributes are memory mapped and shared between nodes."""
+    numpy = pytest.importorskip("numpy")
+    waypoints = numpy.arange(12.0).reshape(4, 3)
+    numpy.save(tmp_path / "waypoints.npy", waypoints)
+    xml = tmp_path / "tree.xml"
+    xml.write_text(
+        """<py_trees.composites.Sequence name="Arrays" memory="$(False)">
+  <py_trees.behaviours.SetBlackboardVariable name="First" variable_name="first"
+    variable_value="$array(waypoints.npy)" overwrite="$(True)" />
+  <py_trees.behaviours.SetBlackboardVariable name="Second" variable_name="second"
+    variable_value="$array(waypoints.npy)" overwrite="$(True)" />
+</py_trees.composites.Sequence>"""
+    )
+
+    first, second = BTParser(str(xml)).parse().children
+
+    first_value = first.variable_value_generator()
+    assert isinstance(first_value, numpy.memmap)
+    assert first_value is second.variable_value_generator()
+    assert not first_value.flags.writeable
+    assert (first_value == waypoints).all()
+
+
+def test_array_attribute_subtree(ros_init, tmp_path):
+    """Test that relative $array() paths in subtrees resolve against the subtree file."""
+    numpy = pytest.importorskip("numpy")
+    (tmp_path / "sub").mkdir()
+    numpy.save(tmp_path / "sub" / "waypoints.npy", numpy.arange(3.0))
+    (tmp_path / "sub" / "inner.xml").write_text(
+        """<py_trees.behaviours.SetBlackboardVariable name="Inner" variable_name="inner"
+  variable_value="$array(waypoints.npy)" overwrite="$(True)" />"""
+    )
+    xml = tmp_path / "tree.xml"
+    xml.write_text(
+        f"""<py_trees.composites.Sequence name="Arrays" memory="$(False)">
+  <subtree name="inner" include="{tmp_path / "sub" / "inner.xml"}" />
+</py_trees.composites.Sequence>"""
+    )
+
+    for optimize in (False, True):
+        root = BTParser(str(xml)).parse(optimize=optimize)
+        inner = next(node for node in root.iterate() if node.name == "Inner")
+        assert (inner.variable_value_generator() == numpy.arange(3.0)).all()
+
+    inner = BTParser(str(xml)).parse(target="Inner")
+    assert (inner.variable_value_generator() == numpy.arange(3.0)).all()
+
+
+def test_optimize(ros_init):
+    """Test that the optimizer removes structural nesting and reports the rewrites."""
+    parser = BTParser(os.path.join(SHARE_DIR, "test/data/test_optimize.xml"))
+    root = parser.parse()
+    assert [child.name for child in root.children] == [
+        "Inner",
+        "Pass Through",
+        "Single Child",
+        "With Memory",
+    ]
+    assert parser.rewrites == []
+
+    root = parser.parse(optimize=True)
+    assert [child.name for child in root.children] == [
+        "First",
+        "Second",
+        "Third",
+        "SubTreeSub",
+        "With Memory",
+    ]
+    assert sorted(rewrite.rule for rewrite in parser.rewrites) == [
+        "collapse_nested",
+        "drop_pass_through",
+        "inline_single_child",
+    ]
+
+
+def test_fused_conditions(ros_init):
+    """Test that sibling blackboard checks are fused without changing the outcome."""
+    parser = BTParser(os.path.join(SHARE_DIR, "test/data/test_fused_conditions.xml"))
+    root = parser.parse(optimize=True)
+    fused, go = root.children
+
+    assert isinstance(fused, FusedBlackboardCheck)
+    assert fused.name == "Armed? & Battery? & Scan?"
+    assert go.name == "Go"
+
+    writer = py_trees.blackboard.Client(name="Writer")
+    for key in ("armed", "battery", "scan"):
+        writer.register_key(key=key, access=py_trees.common.Access.WRITE)
+    writer.armed = True
+    writer.battery = 20.0
+    writer.scan = True
+
+    tree = py_trees.trees.BehaviourTree(root=root)
+    tree.tick()
+    assert root.status == py_trees.common.Status.FAILURE
+    assert fused.feedback_message == "'battery' comparison failed [v: 20.0][e: 30.0]"
+    assert fused.check_feedback[2] == ""
+
+    writer.battery = 50.0
+    tree.tick()
+    assert root.status == py_trees.common.Status.SUCCESS
+    assert all(fused.check_feedback)
+
+
+def test_fused_conditions_inlined(ros_init, tmp_path):
+    """Test that a sequence reduced to a single fused check is replaced by the check."""
+    xml = tmp_path / "tree.xml"
+    xml.write_text(
+        """<py_trees.composites.Selector name="Root" memory="$(False)">
+  <py_trees.composites.Sequence name="Checks" memory="$(False)">
+    <py_trees.behaviours.CheckBlackboardVariableValue name="Armed?"
+      check="$(py_trees.common.ComparisonExpression('armed', True, operator.eq))" />
+    <py_trees.behaviours.CheckBlackboardVariableValue name="Scan?"
+      check="$(py_trees.common.ComparisonExpression('scan', True, operator.eq))" />
+  </py_trees.composites.Sequence>
+  <py_trees.behaviours.Success name="Fallback" />
+</py_trees.composites.Selector>"""
+    )
+    parser = BTParser(str(xml))
+    root = parser.parse(optimize=True)
+
+    assert isinstance(root.children[0], FusedBlackboardCheck)
+    assert root.children[0].name == "Armed? & Scan?"
+    assert [rewrite.rule for rewrite in parser.rewrites] == [
+        "fuse_conditions",
+        "fuse_conditions",
+        "inline_single_child",
+    ]
+
+
+@pytest.mark.parametrize("setup", [True, False])
+def test_deferred_attributes(ros_init, setup):
+    """Test that $defer() attributes are evaluated on first setup or initialise and cached."""
+    parser = BTParser(os.path.join(SHARE_DIR, "test/data/test_deferred.xml"))
+    root = parser.parse()
+    periodic = root.children[0]
+    thunk = periodic.period
+
+    assert isinstance(thunk, Deferred)
+    assert not thunk.resolved
+
+    tree = py_trees.trees.BehaviourTree(root=root)
+    if setup:
+        tree.setup()
+    tree.tick()
+
+    assert periodic.period == 2
+    assert thunk.resolved
+    assert "initialise" not in vars(periodic)
+
+
+def test_conditional(ros_init):
+    """Test that branches skipped by if or unless are neither included nor constructed."""
+    parser = BTParser(os.path.join(SHARE_DIR, "test/data/test_conditional.xml"))
+    root = parser.parse()
+
+    assert [child.name for child in root.children] == ["Variant", "Unless"]
+    assert [child.name for child in root.children[0].children] == ["Variant B"]
+    assert [os.path.basename(path) for path in parser.include_graph().dependencies()] == [
+        "test_conditional_sub.xml"
+    ]
+    assert "if" not in parser.expand(target="Variant").attrib
+    with pytest.raises(BTParseError):
+        parser.parse(target="Never")
+
+
+def test_conditional_invalid(ros_init, tmp_path):
+    """Test that a condition that is not a boolean is rejected."""
+    xml = tmp_path / "tree.xml"
+    xml.write_text('<py_trees.behaviours.Success name="Maybe" if="maybe" />')
+
+    with pytest.raises(BTParseError):
+        BTParser(str(xml)).parse()
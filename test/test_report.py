@@ -0,0 +1,97 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the static tree cost report."""
+
+import os
+
+import pytest
+from ament_index_python.packages import get_package_share_directory
+
+from py_trees_parser.report import main, tree_report
+
+SHARE_DIR = get_package_share_directory("py_trees_parser")
+
+
+def test_tree_report():
+    """Test the report of a tree without subtrees."""
+    report = tree_report(os.path.join(SHARE_DIR, "test/data/test6.xml"))
+
+    assert report.node_count == 20
+    assert report.node_types["py_trees.composites.Parallel"] == 3
+    assert report.max_depth == 6
+    assert report.parallel_fan_out == [
+        ("TutorialSix", 2),
+        ("TutorialSix/Tasks/Scan/Preempt?/Scanning", 3),
+        ("TutorialSix/Tasks/Scan/Celebrate", 2),
+    ]
+    assert report.ros_nodes == 7
+    assert report.worst_case_ticked == 20
+
+
+def test_tree_report_subtrees():
+    """Test that the report follows subtrees and substitutes their arguments."""
+    report = tree_report(os.path.join(SHARE_DIR, "test/data/test_cascade_args.xml"))
+
+    assert report.node_count == 4
+    assert report.max_depth == 3
+    assert report.expressions == ["$(False)"]
+
+
+def test_tree_report_memory(tmp_path):
+    """Test that a sequence with memory counts as ticking all of its children."""
+    tree_file = tmp_path / "tree.xml"
+    tree_file.write_text(
+        """<py_trees.composites.Sequence name="Resume" memory="$(True)">
+  <py_trees.behaviours.Success name="First" />
+  <py_trees.composites.Selector name="Fallback" memory="$(False)">
+    <py_trees.behaviours.Failure name="Fail" />
+    <py_trees.behaviours.Success name="Succeed" />
+  </py_trees.composites.Selector>
+  <py_trees.decorators.Inverter name="Invert">
+    <py_trees.behaviours.Failure name="Last" />
+  </py_trees.decorators.Inverter>
+</py_trees.composites.Sequence>"""
+    )
+    report = tree_report(str(tree_file))
+
+    assert report.node_count == 7
+    assert report.ros_nodes == 0
+    assert report.worst_case_ticked == 7
+
+
+def test_tree_report_duplicate_parallels(tmp_path):
+    """Test that parallels with the same name are all reported."""
+    parallel = """<py_trees.composites.Parallel name="Both"
+    policy="$(py_trees.common.ParallelPolicy.SuccessOnAll())">
+    <py_trees.behaviours.Success name="A" />
+    <py_trees.behaviours.Success name="B" />
+  </py_trees.composites.Parallel>"""
+    tree_file = tmp_path / "tree.xml"
+    tree_file.write_text(
+        f"""<py_trees.composites.Sequence name="Twice" memory="$(False)">
+  {parallel}
+  {parallel}
+</py_trees.composites.Sequence>"""
+    )
+    report = tree_report(str(tree_file))
+
+    assert report.parallel_fan_out == [("Twice/Both", 2), ("Twice/Both", 2)]
+
+
+def test_tree_report_limits():
+    """Test that the command fails when a limit is exceeded."""
+    tree_file = os.path.join(SHARE_DIR, "test/data/test6.xml")
+    main([tree_file, "--max-ticked", "20"])
+    with pytest.raises(SystemExit):
+        main([tree_file, "--max-ticked", "19"])
@@ -0,0 +1,99 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the shared ROS resource pool."""
+
+import os
+
+import py_trees
+import pytest
+import rclpy
+from ament_index_python.packages import get_package_share_directory
+
+from py_trees_parser.benchmark import FakeNode, ros_stand_ins
+from py_trees_parser.parser import BTParser
+from py_trees_parser.resources import ResourcePool, find_resource_pool
+
+SHARE_DIR = get_package_share_directory("py_trees_parser")
+
+
+@pytest.fixture(scope="module")
+def ros_init():
+    """Initialize ros."""
+    rclpy.init()
+    yield
+    rclpy.shutdown()
+
+
+def test_shared_publisher():
+    """Test that publishers are shared per key and destroyed with the last reference."""
+    node = FakeNode()
+    pool = ResourcePool()
+
+    first = pool.publisher(node, str, "/led_strip/command", 10)
+    second = pool.publisher(node, str, "/led_strip/command", 10)
+    other = pool.publisher(node, str, "/led_strip/command", 1)
+
+    assert first is second
+    assert other is not first
+    assert len(node.publishers) == 2
+    assert pool.references(first) == 2
+
+    pool.release(first)
+    pool.release(other)
+    assert node.publishers == [first]
+    pool.release(second)
+    assert node.publishers == []
+    with pytest.raises(KeyError):
+        pool.release(first)
+
+
+def test_shared_subscription():
+    """Test that a shared subscription passes every message to all of its callbacks."""
+    node = FakeNode()
+    pool = ResourcePool()
+    received = []
+
+    def first(msg):
+        received.append(("first", msg))
+
+    def second(msg):
+        received.append(("second", msg))
+
+    subscription = pool.subscription(node, str, "/scan", first, 10)
+    assert pool.subscription(node, str, "/scan", second, 10) is subscription
+    assert len(node.subscriptions) == 1
+
+    subscription.callback("a")
+    pool.release(subscription, first)
+    subscription.callback("b")
+
+    assert received == [("first", "a"), ("second", "a"), ("second", "b")]
+
+
+def test_parsed_tree_pool(ros_init):
+    """Test that the behaviors of a parsed tree share their publishers and clients."""
+    node = FakeNode()
+    root = BTParser(os.path.join(SHARE_DIR, "test/data/test6.xml")).parse()
+    tree = py_trees.trees.BehaviourTree(root=root)
+    with ros_stand_ins():
+        tree.setup(node=node)
+
+    flashers = [behaviour for behaviour in root.iterate() if behaviour.name.startswith("Flash")]
+    assert len(flashers) == 3
+    assert all(find_resource_pool(flasher) is root.resource_pool for flasher in flashers)
+    assert len({id(flasher.publisher) for flasher in flashers}) == 1
+    assert len([p for p in node.publishers if p.topic == "/led_strip/command"]) == 1
+
+    tree.shutdown()
+    assert [p for p in node.publishers if p.topic == "/led_strip/command"] == []
@@ -0,0 +1,68 @@
+# Copyright 2025 SAM XL
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for transpiling XML trees into Python modules."""
+
+import importlib.util
+import os
+
+import py_trees
+import pytest
+from ament_index_python.packages import get_package_share_directory
+
+from py_trees_parser.parser import BTParser, Deferred
+from py_trees_parser.transpiler import main
+
+SHARE_DIR = get_package_share_directory("py_trees_parser")
+
+
+def _import(path):
+    """Import a generated module from a file."""
+    spec = importlib.util.spec_from_file_location("transpiled_tree", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _structure(root):
+    """Describe a tree by the type and name of its nodes."""
+    return [(type(node), node.name) for node in root.iterate()]
+
+
+@pytest.mark.parametrize(
+    "tree_file",
+    [
+        "test/data/test_idioms.xml",
+        "test/data/test_cascade_args.xml",
+        "test/data/test_package_include.xml",
+    ],
+)
+def test_transpile(tmp_path, tree_file):
+    """Test that the generated module builds the same tree as the parser."""
+    xml = os.path.join(SHARE_DIR, tree_file)
+    main([xml, "-o", str(tmp_path / "tree.py")])
+    module = _import(tmp_path / "tree.py")
+
+    assert _structure(module.build()) == _structure(BTParser(xml).parse())
+    assert BTParser(module.SOURCE).include_graph().digest == module.DIGEST
+
+
+def test_transpile_deferred(tmp_path):
+    """Test that deferred attributes stay deferred in the generated module."""
+    main([os.path.join(SHARE_DIR, "test/data/test_deferred.xml"), "-o", str(tmp_path / "tree.py")])
+    periodic = _import(tmp_path / "tree.py").build().children[0]
+
+    assert isinstance(periodic, py_trees.behaviours.Periodic)
+    assert isinstance(periodic.period, Deferred)
+    periodic.initialise()
+    assert periodic.period == 2